@@ -2,7 +2,31 @@ import math, random
 import pygame
 from typing import List 
 
-from components.visual import Spark
+from components.collision import ENEMY, HELPER, PLAYER_BULLET
+
+
+def derive_hitbox(design: object) -> None:
+    """
+    Derive a bullet design's hitbox from its image, once at startup.
+
+    Every design gets a cached ``mask``. Round designs also get
+    ``hit_radius``, the distance from the image center to the far edge
+    of its outermost opaque pixel; the others get 0.
+
+    :param design: a design with ``image`` and ``shape``.
+    :returns: None
+    """
+    design.mask = pygame.mask.from_surface(design.image)
+    design.hit_radius = 0.0
+
+    if design.shape == "circle":
+        w, h = design.mask.get_size()
+        design.hit_radius = max(
+            math.hypot(x + 0.5 - w / 2, y + 0.5 - h / 2) + 0.5
+            for x in range(w)
+            for y in range(h)
+            if design.mask.get_at((x, y))
+        )
 
 class PurpleBullet:
     def __init__(self):
@@ -19,6 +43,8 @@ class PurpleBullet:
         pygame.draw.circle(self.image, (255, 255, 225), (self.radius, self.radius), self.radius//2, 1)
         
         self.id = 'purple'
+        self.shape = 'circle'  # hit shape
+        derive_hitbox(self)
         
 class YellowBullet:
     def __init__(self):
@@ -30,6 +56,8 @@ class YellowBullet:
         pygame.draw.rect(self.image, self.color, rect, 1)
         pygame.draw.circle(self.image, (255, 255, 255), (6, 6), 3)
         self.id = 'yellow'
+        self.shape = 'rect'  # hit shape
+        derive_hitbox(self)
 
 class BlueBullet:
     def __init__(self):
@@ -46,44 +74,38 @@ class BlueBullet:
         pygame.draw.circle(self.image, (255, 255, 225), (self.radius, self.radius), self.radius//2, 1)
         
         self.id = 'blue'
+        self.shape = 'circle'  # hit shape
+        derive_hitbox(self)
 
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, owner, design):
-        super().__init__()
-        self.owner = owner
-        self.image = design.image
-        self.id = design.id
-        self.rect = self.image.get_rect()
+class Bullet:
+    """
+    A monster bullet handle.
 
-        self.center = pygame.Vector2(0, 0)
-        self.angle = 0.0
-        self.speed = 0.0
-        self.ring_radius = 0.0
-        self.active = False
+    The bullet state lives in a ``BulletField``; this object is the view
+    patterns hold on to when they call ``activate()``.
+    """
 
-    def activate(self, center, angle, speed, radius):
-        self.center = pygame.Vector2(center)
-        self.angle = angle
-        self.speed = speed
-        self.ring_radius = radius
-        self.active = True
+    def __init__(self, field, index, design):
+        self.field = field
+        self.index = index
+        self.assign(design)
 
-    def update(self, dt):
-        if not self.active:
-            return
+    def assign(self, design):
+        self.design = design
+        self.image = design.image
+        self.id = design.id
 
-        self.ring_radius += self.speed
-        x = self.center.x + math.cos(self.angle) * self.ring_radius
-        y = self.center.y + math.sin(self.angle) * self.ring_radius
-        self.rect.center = (x, y)
+    @property
+    def active(self):
+        return bool(self.field.active[self.index])
 
-        # wall
-        if not self.owner.screen.get_rect().colliderect(self.rect):
-            self.active = False
+    @property
+    def rect(self):
+        return self.field.rect(self.index)
 
-    def render(self, surf):
-        surf.blit(self.image, self.rect)
+    def activate(self, center, angle, speed, radius, **behavior):
+        self.field.activate(self.index, center, angle, speed, radius, **behavior)
 
 class Gun:
     """
@@ -107,9 +129,8 @@ class Gun:
         * plays animation
         """
 
-        bullet = BulletAK(self.owner)
+        bullet = self.owner.game.player_bullets.acquire(self.owner)
         bullet.activate()
-        self.owner.game.bullets.append(bullet)
         self.owner.on_fire()
 
 
@@ -125,23 +146,22 @@ class BulletAK:
         * rendering
 
     .. note::
-        Bullets is inactive until ``activate()`` is called
+        Bullets is inactive until ``activate()`` is called. Bullets are pooled
+        by the game, ``reset()`` re-arms a recycled bullet for a new owner.
     """
 
-    def __init__(self, owner: object):
+    def __init__(self, game: object):
         """
         Initialize an inactive bullet.
 
-        :param owner: the weapon attached to an entity that fired the bullet.
-
-        .. note::
-            owner object must have a game object
+        :param game: the main game engine instance.
         """
-        self.owner = owner
-        self.game = owner.game
+        self.owner = None
+        self.game = game
 
         # Physical Properties
         self.pos = pygame.Vector2(0, 0)
+        self.prev_pos = pygame.Vector2(0, 0)
         self.size = (1, 1)
         self.speed = 18
         self.velocity = pygame.Vector2(0, -1)
@@ -149,6 +169,10 @@ class BulletAK:
         self.length = 25
         self.damage = 5
 
+        # Collision layer and the layers it hits
+        self.layer = PLAYER_BULLET
+        self.mask = ENEMY | HELPER
+
         # Rendering State
         self.color = (250, 250, 250)
         self.image = pygame.Surface(self.size, pygame.SRCALPHA)
@@ -158,6 +182,27 @@ class BulletAK:
         self.bullet_effect: List[object] = []
         self.collision_effect: List[object] = []
 
+    def reset(self, owner: object) -> None:
+        """
+        Re-arm a pooled bullet.
+
+        :param owner: the entity firing the bullet.
+
+        .. note::
+            owner object must have a game object
+        """
+        self.owner = owner
+        self.active = False
+        self.bullet_effect.clear()
+        self.collision_effect.clear()
+
+    @property
+    def finished(self) -> bool:
+        """
+        The bullet is spent and all of its effects have played out.
+        """
+        return not (self.active or self.bullet_effect or self.collision_effect)
+
     def activate(self) -> None:
         """
         Initializes the bullet's starting position with a slight random spread.
@@ -165,9 +210,10 @@ class BulletAK:
         :returns: None
         """
         spread = random.uniform(-2, 2)
-        self.pos = pygame.Vector2(
+        self.pos.update(
             self.game.player.rect.centerx + spread, self.game.player.rect.top
         )
+        self.prev_pos.update(self.pos)
         self.rect.center = self.pos
         self.active = True
 
@@ -177,7 +223,7 @@ class BulletAK:
             spread = random.uniform(-0.4, 0.4)
             speed = random.uniform(1, 2)
             self.bullet_effect.append(
-                Spark(self.pos, angle + spread, speed, (255, 255, 255))
+                self.game.sparks.acquire(self.pos, angle + spread, speed, (255, 255, 255))
             )
 
     def update(self) -> None:
@@ -190,22 +236,27 @@ class BulletAK:
             pass
         else:
             # store previous position b4 moving
-            self.prev_pos = self.pos.copy()
+            self.prev_pos.update(self.pos)
 
         # Advance position based on velocity
             self.pos += self.velocity * self.speed
             self.rect.center = self.pos
 
         # Update and prune effects
-        for e in self.bullet_effect.copy():
-            kill = e.update()
-            if kill:
-                self.bullet_effect.remove(e)
+        self._update_effects(self.bullet_effect)
+        self._update_effects(self.collision_effect)
+
+    def _update_effects(self, effects: List[object]) -> None:
+        """
+        Update sparks and hand the expired ones back to the spark pool.
 
-        for c in self.collision_effect.copy():
-            kill = c.update()
-            if kill:
-                self.collision_effect.remove(c)
+        :param effects: one of the bullet's spark lists.
+        :returns: None
+        """
+        for i in range(len(effects) - 1, -1, -1):
+            if effects[i].update():
+                self.game.sparks.release(effects[i])
+                del effects[i]
 
     def collided(self) -> None:
         """
@@ -213,34 +264,46 @@ class BulletAK:
 
         :returns: None
         """
-        pos = pygame.Vector2(self.pos)
         for _ in range(5):
             angle = random.uniform(0, math.pi * 2)
             speed = random.uniform(2, 3)
-            self.collision_effect.append(Spark(pos, angle, speed, (255, 255, 255)))
+            self.collision_effect.append(
+                self.game.sparks.acquire(self.pos, angle, speed, (255, 255, 255))
+            )
 
     
-    def check_collision(self, target) -> bool:
+    def x_span(self) -> tuple:
+        """
+        Horizontal extent of the segment travelled this frame, padded a
+        pixel for ``clipline`` rounding.
+
+        :returns: ``(left, right)``
+        """
+        return min(self.prev_pos.x, self.pos.x) - 1, max(self.prev_pos.x, self.pos.x) + 1
+
+    def check_collision(self, rect: pygame.Rect) -> bool:
         if not self.active:
             return False
         
         start = self.prev_pos
         end = self.pos
 
-        return target.rect.clipline(start, end) != () 
+        return rect.clipline(start, end) != () 
     
 
-    def render(self, surf: pygame.Surface) -> None:
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
         """
         Draws the bullet trail and associated particles to the screen.
 
         :param surf: The Pygame surface to draw onto.
+        :param alpha: how far between the last two steps to draw, 0 to 1.
         :returns: None
         """
         if self.active:
             # Draw bullet as a line to simulate high-speed motion blur
-            end_pos = self.pos - self.velocity * self.length
-            pygame.draw.line(surf, self.color, self.pos, end_pos, 1)
+            pos = self.prev_pos.lerp(self.pos, alpha)
+            end_pos = pos - self.velocity * self.length
+            pygame.draw.line(surf, self.color, pos, end_pos, 1)
 
         for s in self.bullet_effect:
             s.render(surf)
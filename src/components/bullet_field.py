@@ -0,0 +1,1070 @@
+import numpy as np
+import pygame
+from itertools import repeat
+from typing import Dict, List, Tuple
+
+from components.bullet import Bullet
+from components.collision import SpatialHash, ENEMY_BULLET, PLAYER
+from components.timer_wheel import TimerWheel
+
+EXHAUSTION_POLICIES = ("drop", "recycle", "grow")
+
+NEVER = np.iinfo(np.int64).max  # expiry tick of a bullet that never leaves
+
+# pygame-ce's blits without per-blit checks or return values
+FAST_BLITS = hasattr(pygame.Surface, "fblits")
+
+
+class SubPool:
+    """
+    The slots reserved for one bullet design.
+
+    Handles
+    """""""
+    * its own capacity and free-list
+    * the fallback policy when the design runs out
+    * the exhaustion policy once fallbacks are dry
+    * growing in chunks and shrinking back after quiet periods
+    """
+
+    def __init__(
+        self,
+        design: object,
+        capacity: int,
+        reserve: int = 0,
+        fallback: Tuple[str, ...] = (),
+        policy: str = "drop",
+        ceiling: int | None = None,
+        chunk: int = 64,
+        shrink_after: float = 5.0,
+    ):
+        """
+        Initiate a design sub-pool.
+
+        :param design: the bullet design, e.g. ``PurpleBullet()``.
+        :param capacity: number of bullets pre-allocated for the design.
+        :param reserve: free bullets kept back from other designs' fallback requests.
+        :param fallback: design ids to borrow from, in order, when this pool runs out.
+        :param policy: what to do when the pool is exhausted, one of
+            ``"drop"``, ``"recycle"`` (retire the oldest live bullet) or ``"grow"``.
+        :param ceiling: the most bullets the pool may grow to, defaults to ``capacity``.
+        :param chunk: bullets added per growth step and removed per shrink step.
+        :param shrink_after: seconds a grown pool must sit a chunk below its size
+            before it gives that chunk back.
+        """
+        if policy not in EXHAUSTION_POLICIES:
+            raise ValueError(f"unknown exhaustion policy {policy!r} for {design.id!r}")
+
+        self.design = design
+        self.id = design.id
+        self.capacity = capacity
+        self.reserve = reserve
+        self.fallback = tuple(fallback)
+        self.policy = policy
+        self.ceiling = max(capacity, ceiling or capacity)
+        self.chunk = chunk
+        self.shrink_after = shrink_after
+        self.quiet = 0.0
+
+        # set by the field
+        self.slots: List[int] = []
+        self.free: List[int] = []
+
+    @property
+    def in_use(self) -> int:
+        return len(self.slots) - len(self.free)
+
+    def available(self, typed: bool = True) -> int:
+        """
+        Number of bullets a request may take from this pool.
+
+        :param typed: ``True`` when the request asked for this design.
+        :returns: int
+        """
+        if typed:
+            return len(self.free)
+        return max(0, len(self.free) - self.reserve)
+
+    def take(self, n: int, typed: bool = True) -> List[int]:
+        """
+        Pop up to ``n`` slots off the free-list.
+
+        :param n: number of slots requested.
+        :param typed: ``True`` when the request asked for this design.
+        :returns: a list of slots
+        """
+        take = min(n, self.available(typed))
+        if take <= 0:
+            return []
+        slots = self.free[-take:]
+        del self.free[-take:]
+        return slots
+
+    def reset(self) -> None:
+        """
+        Mark every slot of the pool free.
+
+        :returns: None
+        """
+        self.free = list(self.slots)
+
+
+class PoolStats:
+    """
+    Per-stage pool telemetry for one design.
+
+    ..note::
+        ``high_watermark`` is the most bullets of the design alive at once,
+        the number to size ``capacity`` from.
+    """
+
+    def __init__(self):
+        self.high_watermark = 0
+        self.exhausted = 0  # requests the free-list could not fill
+        self.dropped = 0  # bullets not fired
+        self.recycled = 0  # live bullets retired early
+        self.grown = 0  # bullets added by growth
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class BulletField:
+    """
+    Structure-of-arrays backend for the monster bullet pool.
+
+    Handles
+    """""""
+    * per-bullet state in contiguous NumPy arrays
+    * closed-form trajectories evaluated on demand
+    * analytic wall exit times, retired in bulk by a timer wheel
+    * behavior kernels: acceleration, curving, homing and delayed start
+    * per-design sub-pools with free-list allocation
+    * elastic growth and exhaustion telemetry
+    * an emission queue, flushed once per frame in one batched write
+    * batched rendering, one blit call per design
+    * a spatial hash broadphase for collision queries
+    * vectorized circle and rect hit tests
+    * ``Bullet`` handles for the ``activate()`` contract
+
+    ..note::
+        Slot ``i`` of every array belongs to the bullet handle ``self.bullets[i]``.
+        Patterns keep talking to the handles, the field does the math.
+        Every bullet returned by ``acquire()`` must be activated by the caller.
+
+        A radial bullet waits ``delay`` ticks, then moves along its ray,
+        gaining ``accel`` speed every tick, so its position is a pure function
+        of the tick. Nothing per bullet changes between activation and
+        retirement.
+
+        Curving (``ang_vel``) and homing bullets are steered: their position is
+        integrated every tick, in one batch for all of them, and they are
+        wall-checked every tick instead of going through the timer wheel.
+    """
+
+    # per-slot arrays, grown together
+    ARRAYS = (
+        ("center_x", np.float64),
+        ("center_y", np.float64),
+        ("angle", np.float64),
+        ("speed", np.float64),
+        ("ring_radius", np.float64),
+        ("spawn", np.int64),
+        ("expire", np.int64),
+        ("active", bool),
+        ("design", np.int8),
+        ("serial", np.int64),
+        ("dir_x", np.float64),
+        ("dir_y", np.float64),
+        ("accel", np.float64),
+        ("ang_vel", np.float64),
+        ("homing", np.float64),
+        ("delay", np.int64),
+        ("steered", bool),
+        ("px", np.float64),
+        ("py", np.float64),
+        ("prev_x", np.float64),
+        ("prev_y", np.float64),
+        ("heading", np.float64),
+        ("velocity", np.float64),
+        ("width", np.int32),
+        ("height", np.int32),
+        ("hit_radius", np.float64),
+    )
+
+    def __init__(self, owner: object, pools: List[SubPool], default: str | None = None):
+        """
+        Pre-allocate the bullet arrays.
+
+        :param owner: the main game engine instance.
+        :param pools: one ``SubPool`` per bullet design.
+        :param default: design id untyped requests draw from, defaults to
+            the first pool's.
+        """
+        self.owner = owner
+        self.pools = pools
+        self.pool_by_id = {pool.id: pool for pool in pools}
+        self.default = default if default is not None else pools[0].id
+        self.designs = [pool.design for pool in pools]
+
+        # designs tested pixel by pixel against their cached mask
+        self.mask_designs = np.array(
+            [i for i, design in enumerate(self.designs) if design.shape == "mask"], dtype=np.int8
+        )
+        self.rect_masks: Dict[Tuple[int, int], pygame.Mask] = {}
+
+        # Bullet state, see ``ARRAYS``
+        # center, angle, speed and ring_radius (at spawn) describe the ray,
+        # spawn and expire are ticks, serial orders activations and dir
+        # is cached at activation. accel, ang_vel, homing and delay are the
+        # behavior kernels; px/py, prev, heading and velocity are the
+        # integrated state of steered bullets. hit_radius is the design's
+        # radius for round designs, 0 for the others.
+        for name, dtype in self.ARRAYS:
+            setattr(self, name, np.zeros(0, dtype=dtype))
+
+        self.bullets: List[Bullet] = []
+        self.spare: List[int] = []  # slots given back by shrinking pools
+        self.serial_counter = 0
+        self.tick = 0
+        self.wheel = TimerWheel(self.tick)
+        self.steered_slots = set()
+        self.pending = []  # emissions queued for the next flush
+
+        # Broadphase, rebuilt at most once per tick
+        self.grid = SpatialHash(owner.display.get_rect())
+        self.grid_tick = -1
+
+        # Collision layer and the layers it hits
+        self.layer = ENEMY_BULLET
+        self.mask = PLAYER
+
+        # Telemetry
+        self.stage = "start"
+        self.stats: Dict[str, Dict[str, PoolStats]] = {}
+        self.set_stage(self.stage)
+
+        for pool in pools:
+            self._add_slots(pool, pool.capacity)
+
+    def __iter__(self):
+        return iter(self.bullets)
+
+    def __len__(self) -> int:
+        return len(self.bullets)
+
+    # --------------------------------------------------
+    # ALLOCATION
+    # --------------------------------------------------
+
+    def acquire(self, n: int, design: str | None = None) -> List[Bullet]:
+        """
+        Pop up to ``n`` free bullets off the sub-pools.
+
+        :param n: number of bullets requested.
+        :param design: design id to draw from, ``default`` when ``None``.
+        :returns: a list of at most ``n`` inactive ``Bullet``
+        """
+        return [self.bullets[i] for i in self._acquire_slots(n, design)]
+
+    def _acquire_slots(self, n: int, design: str | None = None) -> List[int]:
+        """
+        Pop up to ``n`` free slots off the sub-pools.
+
+        A request drains its own sub-pool first, then borrows from the
+        pool's fallback designs, in order. Untyped requests are requests for
+        the ``default`` design, so a pattern looks the same however busy
+        the pools are. Borrowing never dips into another pool's reserve.
+        Whatever is still missing is handed to the exhaustion policy of the
+        pools.
+
+        :param n: number of bullets requested.
+        :param design: design id to draw from, ``default`` when ``None``.
+        :returns: a list of at most ``n`` free slots
+        """
+        pool = self.pool_by_id[design if design is not None else self.default]
+        acquired = pool.take(n)
+        for fallback in pool.fallback:
+            if len(acquired) >= n:
+                break
+            acquired += self.pool_by_id[fallback].take(n - len(acquired), typed=False)
+
+        if len(acquired) < n:
+            stats = self.stats[self.stage]
+            stats[pool.id].exhausted += 1
+            acquired += self._exhausted(pool, n - len(acquired))
+            stats[pool.id].dropped += n - len(acquired)
+
+        stats = self.stats[self.stage]
+        for pool in self.pools:
+            if pool.in_use > stats[pool.id].high_watermark:
+                stats[pool.id].high_watermark = pool.in_use
+
+        return acquired
+
+    def _exhausted(self, pool: SubPool, n: int) -> List[int]:
+        """
+        Apply the pool's exhaustion policy for ``n`` missing bullets.
+
+        :returns: a list of slots
+        """
+        if pool.policy == "grow":
+            room = pool.ceiling - len(pool.slots)
+            if room > 0:
+                grow = min(room, max(pool.chunk, n))
+                self._add_slots(pool, grow)
+                self.stats[self.stage][pool.id].grown += grow
+                return pool.take(n)
+
+        elif pool.policy == "recycle":
+            slots = np.asarray(pool.slots)
+            live = slots[self.active[slots]]
+            if live.size:
+                k = min(n, live.size)
+                oldest = live[np.argpartition(self.serial[live], k - 1)[:k]]
+                self.release(oldest)
+                self.stats[self.stage][pool.id].recycled += k
+                return pool.take(k)
+
+        return []
+
+    def release(self, indices) -> None:
+        """
+        Deactivate bullets and push their slots back on the free-list.
+
+        :param indices: a slot or an array of slots.
+        :returns: None
+        """
+        indices = np.atleast_1d(indices)
+        indices = indices[self.active[indices]]
+        if indices.size == 0:
+            return
+
+        self.active[indices] = False
+        if self.steered_slots:
+            self.steered_slots.difference_update(indices.tolist())
+        designs = self.design[indices]
+        for design_index, pool in enumerate(self.pools):
+            pool.free.extend(indices[designs == design_index].tolist())
+
+    def _add_slots(self, pool: SubPool, count: int) -> None:
+        """
+        Hand ``count`` slots to ``pool``, reusing spare slots before
+        growing the arrays.
+        """
+        reuse = self.spare[:count]
+        del self.spare[:count]
+
+        start = len(self.bullets)
+        extra = count - len(reuse)
+        if extra > 0:
+            for name, _ in self.ARRAYS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate((array, np.zeros(extra, dtype=array.dtype))))
+            for i in range(start, start + extra):
+                self.bullets.append(Bullet(self, i, pool.design))
+
+        slots = reuse + list(range(start, start + max(extra, 0)))
+        w, h = pool.design.image.get_size()
+        self.design[slots] = self.pools.index(pool)
+        self.width[slots] = w
+        self.height[slots] = h
+        self.hit_radius[slots] = pool.design.hit_radius
+        for i in reuse:
+            self.bullets[i].assign(pool.design)
+
+        pool.slots += slots
+        pool.free += slots
+
+    def _shrink(self, pool: SubPool) -> None:
+        """
+        Give one chunk of free slots back, never below the base capacity.
+        """
+        count = min(pool.chunk, len(pool.slots) - pool.capacity, len(pool.free))
+        if count <= 0:
+            return
+
+        # the highest slots go first so the arrays can be truncated
+        pool.free.sort()
+        freed = pool.free[-count:]
+        del pool.free[-count:]
+        freed_set = set(freed)
+        pool.slots = [i for i in pool.slots if i not in freed_set]
+        self.spare += freed
+
+        self.spare.sort()
+        size = len(self.bullets)
+        while self.spare and self.spare[-1] == size - 1:
+            self.spare.pop()
+            size -= 1
+
+        if size < len(self.bullets):
+            for name, _ in self.ARRAYS:
+                setattr(self, name, getattr(self, name)[:size].copy())
+            del self.bullets[size:]
+
+    # --------------------------------------------------
+    # TELEMETRY
+    # --------------------------------------------------
+
+    def set_stage(self, stage: str) -> None:
+        """
+        Start recording telemetry under a new stage label.
+
+        :param stage: the stage label, e.g. the spawn event or boss phase.
+        :returns: None
+        """
+        self.stage = stage
+        if stage not in self.stats:
+            self.stats[stage] = {pool.id: PoolStats() for pool in self.pools}
+
+    def telemetry(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Pool telemetry per stage and design.
+
+        :returns: ``{stage: {design id: stats dict}}``
+        """
+        return {
+            stage: {design: stats.as_dict() for design, stats in designs.items()}
+            for stage, designs in self.stats.items()
+        }
+
+    # --------------------------------------------------
+    # SIMULATION
+    # --------------------------------------------------
+
+    def activate(
+        self,
+        index: int,
+        center,
+        angle: float,
+        speed: float,
+        radius: float,
+        accel: float = 0.0,
+        ang_vel: float = 0.0,
+        homing: float = 0.0,
+        delay: int = 0,
+    ) -> None:
+        """
+        Fire the bullet in slot ``index``.
+
+        :param index: the bullet slot.
+        :param center: origin of the ray.
+        :param angle: direction in radians.
+        :param speed: radius gained per tick.
+        :param radius: starting distance from the origin.
+        :param accel: speed gained per tick.
+        :param ang_vel: heading change per tick, in radians.
+        :param homing: most the heading may turn towards the player per tick, in radians.
+        :param delay: ticks the bullet holds still before moving.
+        :returns: None
+        """
+        angle = np.array([angle], dtype=np.float64)
+        cx, cy = center
+        self._write(
+            np.array([index]), cx, cy, angle, np.cos(angle), np.sin(angle),
+            speed, radius, accel, ang_vel, homing, delay,
+        )
+
+    def queue(
+        self,
+        n: int,
+        design: str | None,
+        center,
+        directions: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        speed,
+        radius: float,
+        **behavior,
+    ) -> None:
+        """
+        Queue an emission of ``n`` bullets for the next ``flush()``.
+
+        :param n: number of bullets requested.
+        :param design: design id to draw from, ``default`` when ``None``.
+        :param center: origin of the rays.
+        :param directions: ``(angle, dir_x, dir_y)`` arrays of at least ``n``
+            entries, e.g. a pattern's direction table. They are read at
+            flush time and must not be changed before.
+        :param speed: radius gained per tick, one for all or one per bullet.
+        :param radius: starting distance from the origin.
+        :param behavior: the behavior kernels, see ``activate()``.
+        :returns: None
+        """
+        cx, cy = center
+        self.pending.append((n, design, cx, cy, directions, speed, radius, behavior))
+
+    def flush(self) -> None:
+        """
+        Fire every queued emission at once.
+
+        All bullets of a design are acquired in one go, handed out in
+        queue order, and the whole frame's bullets are written in one
+        batched write.
+
+        :returns: None
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+
+        wanted: Dict[str | None, int] = {}
+        for n, design, *_ in pending:
+            wanted[design] = wanted.get(design, 0) + n
+        free = {design: self._acquire_slots(n, design) for design, n in wanted.items()}
+        taken = dict.fromkeys(free, 0)
+
+        columns = [[] for _ in range(12)]
+        for n, design, cx, cy, (angle, dir_x, dir_y), speed, radius, behavior in pending:
+            start = taken[design]
+            slots = free[design][start:start + n]
+            taken[design] = start + len(slots)
+            k = len(slots)
+            if k == 0:
+                continue
+
+            values = (
+                slots, cx, cy, angle[:k], dir_x[:k], dir_y[:k],
+                speed[:k] if np.ndim(speed) else speed, radius,
+                behavior.get("accel", 0.0), behavior.get("ang_vel", 0.0),
+                behavior.get("homing", 0.0), behavior.get("delay", 0),
+            )
+            for column, value in zip(columns, values):
+                column.append(np.broadcast_to(value, k))
+
+        if columns[0]:
+            slots, *state = (np.concatenate(column) for column in columns)
+            self._write(slots.astype(np.int64), *state)
+
+    def _write(
+        self,
+        slots: np.ndarray,
+        cx,
+        cy,
+        angle,
+        dir_x,
+        dir_y,
+        speed,
+        radius,
+        accel=0.0,
+        ang_vel=0.0,
+        homing=0.0,
+        delay=0,
+    ) -> None:
+        """
+        Write the state of freshly fired bullets and schedule their exit.
+        Every argument after ``slots`` is one value for all or one per slot.
+        """
+        k = slots.size
+
+        self.center_x[slots] = cx
+        self.center_y[slots] = cy
+        self.angle[slots] = angle
+        self.speed[slots] = speed
+        self.ring_radius[slots] = radius
+        self.dir_x[slots] = dir_x
+        self.dir_y[slots] = dir_y
+        self.accel[slots] = accel
+        self.ang_vel[slots] = ang_vel
+        self.homing[slots] = homing
+        self.delay[slots] = delay
+        self.spawn[slots] = self.tick
+        self.active[slots] = True
+        self.grid_tick = -1
+
+        self.serial[slots] = np.arange(self.serial_counter, self.serial_counter + k)
+        self.serial_counter += k
+
+        steer = (self.ang_vel[slots] != 0) | (self.homing[slots] != 0)
+        self.steered[slots] = steer
+        if steer.any():
+            steered = slots[steer]
+            self.px[steered] = self.prev_x[steered] = (
+                self.center_x[steered] + self.dir_x[steered] * self.ring_radius[steered]
+            )
+            self.py[steered] = self.prev_y[steered] = (
+                self.center_y[steered] + self.dir_y[steered] * self.ring_radius[steered]
+            )
+            self.heading[steered] = self.angle[steered]
+            self.velocity[steered] = self.speed[steered]
+            self.expire[steered] = NEVER
+            self.steered_slots.update(steered.tolist())
+
+        radial = slots[~steer]
+        if radial.size == 0:
+            return
+        # saturate, a bullet that never leaves stays at ``NEVER``
+        ticks = self.exit_ticks(radial)
+        leaves = ticks < NEVER
+        expire = np.full(radial.size, NEVER, dtype=np.int64)
+        expire[leaves] = self.tick + ticks[leaves]
+        self.expire[radial] = expire
+        for index, tick in zip(radial[leaves].tolist(), expire[leaves].tolist()):
+            self.wheel.schedule(index, tick)
+
+    def exit_ticks(self, indices) -> np.ndarray:
+        """
+        Ticks after activation at which radial bullets stop overlapping
+        the play area.
+
+        The bullet's rect overlaps the bounds while its center is inside the
+        bounds grown by half the sprite (less the half pixel ``Rect`` rounds
+        away), which is an interval of radii along the ray. The exit tick is
+        the first tick the radius, a quadratic in the ticks moved, leaves it.
+
+        :param indices: a slot or an array of slots.
+        :returns: ticks, ``NEVER`` for bullets that never leave
+        """
+        bounds = self.owner.display.get_rect()
+        w = self.width[indices]
+        h = self.height[indices]
+        r0 = self.ring_radius[indices]
+        delay = self.delay[indices]
+
+        low_x, high_x = _ray_interval(
+            self.center_x[indices], self.dir_x[indices],
+            bounds.left - (w - w // 2) + 0.5, bounds.right + w // 2 - 0.5,
+        )
+        low_y, high_y = _ray_interval(
+            self.center_y[indices], self.dir_y[indices],
+            bounds.top - (h - h // 2) + 0.5, bounds.bottom + h // 2 - 0.5,
+        )
+        low = np.maximum(low_x, low_y)
+        high = np.minimum(high_x, high_y)
+
+        # radius after t moving ticks: r0 + b * t + c * t**2
+        c = self.accel[indices] / 2
+        b = self.speed[indices] + c
+        moved = np.minimum(
+            _first_tick_above(r0, b, c, high),
+            _first_tick_above(-r0, -b, -c, -low),
+        )
+
+        # a bullet outside after its first tick, moving or not, goes at once
+        first = np.where(delay > 0, r0, r0 + b + c)
+        ticks = np.atleast_1d(np.where((first < low) | (first > high), 1, moved + delay))
+
+        # only finite ticks go through the cast, ones too far out to come never do
+        out = np.full(ticks.shape, NEVER, dtype=np.int64)
+        finite = np.isfinite(ticks) & (ticks < 2.0 ** 62)
+        out[finite] = ticks[finite].astype(np.int64)
+        return out
+
+    def positions(self, indices, tick: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate bullet positions at a tick.
+
+        Steered bullets only know their last two positions, between which
+        they are interpolated.
+
+        :param indices: a slot or an array of slots.
+        :param tick: the tick to evaluate at, defaults to the current tick.
+        :returns: ``(x, y)`` arrays
+        """
+        if tick is None:
+            tick = self.tick
+        moved = np.maximum(0, tick - self.spawn[indices] - self.delay[indices])
+        radius = (
+            self.ring_radius[indices]
+            + self.speed[indices] * moved
+            + self.accel[indices] * moved * (moved + 1) / 2
+        )
+        x = self.center_x[indices] + self.dir_x[indices] * radius
+        y = self.center_y[indices] + self.dir_y[indices] * radius
+
+        steered = self.steered[indices]
+        if np.any(steered):
+            alpha = tick - self.tick + 1
+            prev_x, prev_y = self.prev_x[indices], self.prev_y[indices]
+            x = np.where(steered, prev_x + (self.px[indices] - prev_x) * alpha, x)
+            y = np.where(steered, prev_y + (self.py[indices] - prev_y) * alpha, y)
+        return x, y
+
+    def live(self) -> np.ndarray:
+        """
+        Indices of the active bullets.
+
+        :returns: an index array
+        """
+        return np.flatnonzero(self.active)
+
+    def near(self, rect: pygame.Rect) -> np.ndarray:
+        """
+        Live bullets that may overlap ``rect``, now or on their way
+        here from the previous tick.
+
+        :param rect: the query area, e.g. the player hitbox.
+        :returns: an index array
+        """
+        if self.grid_tick != self.tick:
+            live = self.live()
+            x, y = self.positions(live)
+            prev_x, prev_y = self.positions(live, self.tick - 1)
+            step = max(np.abs(x - prev_x).max(initial=0), np.abs(y - prev_y).max(initial=0))
+            reach = (max(self.width.max(initial=0), self.height.max(initial=0)) + 1) // 2
+            self.grid.rebuild(live, x, y, int(reach + np.ceil(step)))
+            self.grid_tick = self.tick
+
+        near = self.grid.query(rect)
+        return near[self.active[near]]
+
+    def hits(
+        self,
+        rect: pygame.Rect,
+        indices: np.ndarray | None = None,
+        shapes: bool = True,
+        swept: bool = True,
+    ) -> np.ndarray:
+        """
+        Bullets overlapping ``rect``, tested in one array expression.
+
+        Every bullet is tested as its bounding rect, exactly like
+        ``Rect.colliderect``. Round designs must then reach the rect with
+        their ``hit_radius`` and ``"mask"`` designs with an opaque pixel of
+        their cached ``mask``, both derived once per design at startup.
+
+        A bullet can pass over a small hitbox, or clip its corner, between
+        two ticks, so by default every bullet that moved also tests the
+        segment it travelled since the previous tick: as the sprite swept
+        along it, and for round designs as the capsule of ``hit_radius``
+        around it. Only crossings strictly between the ticks count, a
+        bullet touching the rect at either end is left to the test where
+        it is, so each hit is reported on one tick.
+
+        :param rect: the target hitbox.
+        :param indices: the bullets to test, defaults to every live bullet.
+        :param shapes: ``False`` tests every bullet as its bounding rect.
+        :param swept: ``False`` only tests where the bullets are now.
+        :returns: an index array of the bullets that hit
+        """
+        if indices is None:
+            indices = self.live()
+        if indices.size == 0 or rect.width <= 0 or rect.height <= 0:
+            return indices[:0]
+
+        x, y = self.positions(indices)
+        w = self.width[indices]
+        h = self.height[indices]
+        left = _round(x) - w // 2
+        top = _round(y) - h // 2
+        hit = (
+            (left < rect.right) & (left + w > rect.left)
+            & (top < rect.bottom) & (top + h > rect.top)
+        )
+
+        radius = self.hit_radius[indices]
+        cx = left + w / 2
+        cy = top + h / 2
+        if shapes and np.any(radius > 0):
+            # distance from the circle center to the closest point of the rect
+            dx = cx - np.clip(cx, rect.left, rect.right)
+            dy = cy - np.clip(cy, rect.top, rect.bottom)
+            circle = dx * dx + dy * dy < radius * radius
+            hit &= (radius == 0) | circle
+
+        if shapes and self.mask_designs.size:
+            # pixel test, only for the few bullets already overlapping
+            designs = self.design[indices]
+            for k in np.flatnonzero(hit & np.isin(designs, self.mask_designs)):
+                offset = (rect.left - int(left[k]), rect.top - int(top[k]))
+                mask = self.designs[designs[k]].mask
+                hit[k] = mask.overlap(self._rect_mask(rect.size), offset) is not None
+
+        if swept:
+            prev_x, prev_y = self.positions(indices, self.tick - 1)
+            step_x = cx - (_round(prev_x) - w // 2 + w / 2)
+            step_y = cy - (_round(prev_y) - h // 2 + h / 2)
+            # the box around the whole step must reach the rect
+            low_x = np.minimum(cx, cx - step_x)
+            low_y = np.minimum(cy, cy - step_y)
+            moved = np.flatnonzero(
+                ~hit & ((step_x != 0) | (step_y != 0))
+                & (low_x - w / 2 < rect.right) & (low_x + np.abs(step_x) + w / 2 > rect.left)
+                & (low_y - h / 2 < rect.bottom) & (low_y + np.abs(step_y) + h / 2 > rect.top)
+            )
+            if moved.size:
+                hit[moved] = _swept_hits(
+                    rect, cx[moved], cy[moved], step_x[moved], step_y[moved],
+                    w[moved] / 2, h[moved] / 2,
+                    radius[moved] if shapes else np.zeros(moved.size),
+                )
+
+        return indices[hit]
+
+    def _rect_mask(self, size: Tuple[int, int]) -> pygame.Mask:
+        """
+        A filled mask of ``size``, cached per size.
+        """
+        mask = self.rect_masks.get(size)
+        if mask is None:
+            mask = self.rect_masks[size] = pygame.Mask(size, fill=True)
+        return mask
+
+    def update(self, dt: float) -> None:
+        """
+        Fire the queued emissions, advance the field one tick and let
+        quiet pools shrink.
+
+        :param dt: delta time
+        :returns: None
+        """
+        self.flush()
+        self._update_pools(dt)
+        self.advance(1)
+
+    def advance(self, ticks: int) -> None:
+        """
+        Jump the field ``ticks`` ticks forward and retire the bullets
+        that left the play area in the meantime.
+
+        Radial bullets are not touched, but the timer wheel still turns once
+        per tick, as does the steering step while steered bullets are live,
+        so the cost grows with ``ticks``.
+
+        :param ticks: number of ticks to skip.
+        :returns: None
+        """
+        due = []
+        for _ in range(ticks):
+            due += self.wheel.tick()
+            self.tick = self.wheel.now
+            if self.steered_slots:
+                self._steer()
+
+        if not due:
+            return
+
+        # the wheel cancels lazily, skip slots retired or re-fired since
+        due = np.unique(np.array(due))
+        due = due[due < len(self.bullets)]
+        self.release(due[self.expire[due] <= self.tick])
+
+    def _steer(self) -> None:
+        """
+        Integrate one tick of every steered bullet and retire the ones
+        that left the play area.
+        """
+        idx = np.fromiter(self.steered_slots, dtype=np.int64, count=len(self.steered_slots))
+        self.prev_x[idx] = self.px[idx]
+        self.prev_y[idx] = self.py[idx]
+
+        idx = idx[self.tick - self.spawn[idx] > self.delay[idx]]
+        if idx.size == 0:
+            return
+
+        # curving
+        heading = self.heading[idx] + self.ang_vel[idx]
+        x = self.px[idx]
+        y = self.py[idx]
+
+        # homing, turn towards the player by at most ``homing``
+        homing = self.homing[idx]
+        if np.any(homing > 0):
+            # a Vector2 or, once the player has moved, a tuple
+            tx, ty = self.owner.player.pos
+            turn = np.arctan2(ty - y, tx - x) - heading
+            turn = (turn + np.pi) % (2 * np.pi) - np.pi
+            heading += np.clip(turn, -homing, homing)
+
+        # acceleration
+        velocity = self.velocity[idx] + self.accel[idx]
+
+        x = x + np.cos(heading) * velocity
+        y = y + np.sin(heading) * velocity
+        self.heading[idx] = heading
+        self.velocity[idx] = velocity
+        self.px[idx] = x
+        self.py[idx] = y
+
+        # wall, same test as ``Rect.colliderect`` against the play area
+        bounds = self.owner.display.get_rect()
+        w = self.width[idx]
+        h = self.height[idx]
+        left = _round(x) - w // 2
+        top = _round(y) - h // 2
+        inside = (
+            (left < bounds.right) & (left + w > bounds.left)
+            & (top < bounds.bottom) & (top + h > bounds.top)
+        )
+        self.release(idx[~inside])
+
+    def _update_pools(self, dt: float) -> None:
+        """
+        Shrink pools that stayed a chunk below their size for
+        ``shrink_after`` seconds.
+        """
+        for pool in self.pools:
+            in_use = pool.in_use
+            if len(pool.slots) > pool.capacity and in_use <= len(pool.slots) - pool.chunk:
+                pool.quiet += dt
+                if pool.quiet >= pool.shrink_after:
+                    self._shrink(pool)
+                    pool.quiet = 0.0
+            else:
+                pool.quiet = 0.0
+
+    def clear(self) -> None:
+        """
+        Deactivate every bullet and refill the free-list.
+
+        :returns: None
+        """
+        self.active[:] = False
+        for pool in self.pools:
+            pool.reset()
+        self.wheel = TimerWheel(self.tick)
+        self.steered_slots = set()
+        self.pending = []
+
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
+        """
+        Draw every live bullet with one ``blits`` call per design.
+
+        :param surf: The Pygame surface to draw onto.
+        :param alpha: how far between the previous and the current tick
+            to draw the bullets, 0 to 1.
+        :returns: None
+        """
+        live = self.live()
+        if live.size == 0:
+            return
+
+        x, y = self.positions(live, self.tick - 1 + alpha)
+        left = _round(x) - self.width[live] // 2
+        top = _round(y) - self.height[live] // 2
+        designs = self.design[live]
+
+        for design_index, design in enumerate(self.designs):
+            batch = designs == design_index
+            if not batch.any():
+                continue
+
+            dests = np.column_stack((left[batch], top[batch])).tolist()
+            sequence = zip(repeat(design.image), dests)
+            if FAST_BLITS:
+                surf.fblits(sequence)
+            else:
+                surf.blits(sequence, doreturn=False)
+
+    def rect(self, index: int) -> pygame.Rect:
+        """
+        Bounding rect of the bullet in slot ``index``.
+
+        :param index: the bullet slot.
+        :returns: pygame.Rect
+        """
+        x, y = self.positions(index)
+        rect = pygame.Rect(0, 0, int(self.width[index]), int(self.height[index]))
+        rect.center = (x, y)
+        return rect
+
+
+def _ray_interval(origin, direction, low, high) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Radii along a ray for which one coordinate stays inside ``[low, high]``.
+
+    :returns: ``(low, high)`` radius arrays, infinite when unbounded
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (low - origin) / direction
+        b = (high - origin) / direction
+
+    inside = (origin >= low) & (origin <= high)
+    flat = direction == 0
+    start = np.where(flat, np.where(inside, -np.inf, np.inf), np.minimum(a, b))
+    end = np.where(flat, np.where(inside, np.inf, -np.inf), np.maximum(a, b))
+    return start, end
+
+
+def _swept_hits(rect, cx, cy, step_x, step_y, half_w, half_h, radius) -> np.ndarray:
+    """
+    Whether bullets that stepped ``(step_x, step_y)`` to ``(cx, cy)``
+    crossed ``rect`` strictly between the two ends, tested as their
+    snapped sprite and, where ``radius`` is set, as a capsule of that radius.
+    """
+    start_x, start_y = cx - step_x, cy - step_y
+    enter, leave = _segment_interval(
+        start_x, start_y, step_x, step_y,
+        rect.left - half_w, rect.right + half_w, rect.top - half_h, rect.bottom + half_h,
+    )
+    # a sprite overlapping at either end is not a crossing
+    hit = (enter >= 0) & (leave <= 1) & (enter < leave)
+
+    round_ = radius > 0
+    if np.any(round_):
+        # the rect grown by the radius with rounded corners
+        capsule = _segment_hits_box(
+            start_x, start_y, step_x, step_y,
+            rect.left - radius, rect.right + radius, rect.top, rect.bottom,
+        ) | _segment_hits_box(
+            start_x, start_y, step_x, step_y,
+            rect.left, rect.right, rect.top - radius, rect.bottom + radius,
+        )
+        length = step_x * step_x + step_y * step_y
+        for corner_x, corner_y in (rect.topleft, rect.topright, rect.bottomleft, rect.bottomright):
+            t = np.clip(
+                ((corner_x - start_x) * step_x + (corner_y - start_y) * step_y) / length, 0, 1
+            )
+            dx = start_x + t * step_x - corner_x
+            dy = start_y + t * step_y - corner_y
+            capsule |= dx * dx + dy * dy < radius * radius
+
+        # nor is a circle already reaching the rect where it started
+        dx = start_x - np.clip(start_x, rect.left, rect.right)
+        dy = start_y - np.clip(start_y, rect.top, rect.bottom)
+        capsule &= dx * dx + dy * dy >= radius * radius
+        hit = np.where(round_, capsule, hit)
+
+    return hit
+
+
+def _segment_hits_box(x, y, dx, dy, left, right, top, bottom) -> np.ndarray:
+    """
+    Whether the segments from ``(x, y)`` to ``(x + dx, y + dy)`` pass
+    through the inside of the boxes.
+    """
+    start, end = _segment_interval(x, y, dx, dy, left, right, top, bottom)
+    return np.maximum(start, 0) < np.minimum(end, 1)
+
+
+def _segment_interval(x, y, dx, dy, left, right, top, bottom) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The stretch of the lines through ``(x, y)`` along ``(dx, dy)`` that is
+    inside the boxes, as fractions of ``(dx, dy)``, empty when the start
+    is not below the end.
+    """
+    start_x, end_x = _ray_interval(x, dx, left, right)
+    start_y, end_y = _ray_interval(y, dy, top, bottom)
+    return np.maximum(start_x, start_y), np.minimum(end_x, end_y)
+
+
+def _first_tick_above(a, b, c, bound) -> np.ndarray:
+    """
+    Smallest whole ``t >= 1`` with ``a + b*t + c*t**2 > bound``, infinite
+    when there is none. Assumes the quadratic is not above ``bound`` at ``t = 1``.
+    """
+    d = a - bound
+    with np.errstate(divide="ignore", invalid="ignore"):
+        linear = np.where(b > 0, np.floor(-d / b) + 1, np.inf)
+
+        disc = b * b - 4 * c * d
+        root = np.sqrt(np.maximum(disc, 0))
+        r1 = (-b - root) / (2 * c)
+        r2 = (-b + root) / (2 * c)
+        lower = np.minimum(r1, r2)
+        upper = np.maximum(r1, r2)
+
+        # opening up: above the bound past the upper root
+        convex = np.floor(upper) + 1
+        # opening down: above the bound only between the roots
+        concave = np.maximum(np.floor(lower) + 1, 1)
+        concave = np.where((disc > 0) & (concave < upper), concave, np.inf)
+
+    ticks = np.where(c == 0, linear, np.where(c > 0, convex, concave))
+    return np.maximum(ticks, 1)
+
+
+def _round(values: np.ndarray) -> np.ndarray:
+    """
+    Round half away from zero, the way ``Rect`` snaps float coordinates.
+    """
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int32)
@@ -0,0 +1,417 @@
+import math
+from operator import itemgetter
+
+import numpy as np
+import pygame
+from typing import Callable, Dict, List, Tuple
+
+
+class SpatialHash:
+    """
+    A uniform grid over the play area for point-like items.
+
+    Handles
+    """""""
+    * binning every item into the cell under its center in one batch
+    * returning the items in the cells around a query rect
+
+    ..note::
+        The grid is rebuilt from scratch, as a counting sort on cell keys,
+        so a query costs as much as the items near it, not the items in it.
+        Items outside the grid are clamped into its border cells, which can
+        only make a query see more, never less.
+    """
+
+    def __init__(self, bounds: pygame.Rect, cell: int = 16):
+        """
+        Initiate an empty grid.
+
+        :param bounds: the area the grid covers.
+        :param cell: side length of a cell in pixels.
+        """
+        self.left, self.top = bounds.topleft
+        self.cell = cell
+        self.cols = math.ceil(bounds.width / cell)
+        self.rows = math.ceil(bounds.height / cell)
+
+        self.items = np.zeros(0, dtype=np.int64)  # items ordered by cell
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.int64)
+        self.reach = 0  # largest distance from an item center to its edge
+
+    def rebuild(self, items: np.ndarray, x: np.ndarray, y: np.ndarray, reach: int) -> None:
+        """
+        Bin ``items`` by their centers.
+
+        :param items: item ids, e.g. bullet slots.
+        :param x: center x of every item.
+        :param y: center y of every item.
+        :param reach: how far any item extends from its center.
+        :returns: None
+        """
+        col = np.clip((x - self.left) // self.cell, 0, self.cols - 1).astype(np.int64)
+        row = np.clip((y - self.top) // self.cell, 0, self.rows - 1).astype(np.int64)
+        keys = row * self.cols + col
+
+        order = np.argsort(keys, kind="stable")
+        self.items = items[order]
+        self.starts = np.searchsorted(keys[order], np.arange(self.cols * self.rows + 1))
+        self.reach = reach
+
+    def query(self, rect: pygame.Rect) -> np.ndarray:
+        """
+        Items whose cell lies within ``reach`` of ``rect``.
+
+        :param rect: the query area.
+        :returns: an array of item ids
+        """
+        # clamped like the items, so rects off the grid still see its border
+        reach = self.reach + 1
+        col0 = self._clamp((rect.left - reach - self.left) // self.cell, self.cols)
+        col1 = self._clamp((rect.right + reach - self.left) // self.cell, self.cols)
+        row0 = self._clamp((rect.top - reach - self.top) // self.cell, self.rows)
+        row1 = self._clamp((rect.bottom + reach - self.top) // self.cell, self.rows)
+
+        # within a row the cells are contiguous in key order, so one slice each
+        slices = [
+            self.items[self.starts[row * self.cols + col0]:self.starts[row * self.cols + col1 + 1]]
+            for row in range(row0, row1 + 1)
+        ]
+        return np.concatenate(slices)
+
+    @staticmethod
+    def _clamp(index: int, count: int) -> int:
+        """
+        Clamp a cell index into ``[0, count)``.
+        """
+        return min(max(index, 0), count - 1)
+
+
+class SweepAndPrune:
+    """
+    A sort-and-sweep broadphase along x between attackers and targets.
+
+    Handles
+    """""""
+    * a persistent interval list, re-sorted every frame
+    * pairing attackers with the targets their x interval overlaps
+
+    ..note::
+        Things move little between frames, so last frame's order is
+        almost sorted and the re-sort is close to linear.
+    """
+
+    ATTACKER = 0
+    TARGET = 1
+
+    def __init__(self):
+        """
+        Initiate an empty interval list.
+        """
+        self.entries: Dict[int, list] = {}
+        self.order: List[list] = []  # [left, right, side, payload, frame]
+        self.frame = 0
+
+    def pairs(self, items) -> Dict[int, Tuple[object, list]]:
+        """
+        Update the intervals and sweep them.
+
+        :param items: ``(key, left, right, side, payload)`` for everything
+            taking part this frame, attackers and targets alike.
+        :returns: ``{key: (attacker, [target payloads])}`` for every
+            attacker that overlaps at least one target
+        """
+        self.frame += 1
+        entries = self.entries
+        for key, left, right, side, payload in items:
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = [left, right, side, payload, self.frame]
+                self.order.append(entry)
+            else:
+                entry[:] = left, right, side, payload, self.frame
+
+        # drop what did not take part, then re-sort the survivors in place
+        if len(self.order) != len(items):
+            self.order = [entry for entry in self.order if entry[4] == self.frame]
+            self.entries = {
+                key: entry for key, entry in entries.items() if entry[4] == self.frame
+            }
+        self.order.sort(key=itemgetter(0))
+
+        pairs = {}
+        open_sides = ([], [])  # attackers and targets whose interval is open
+        for entry in self.order:
+            left, right, side, payload, _ = entry
+            other = open_sides[1 - side]
+            other[:] = [e for e in other if e[1] >= left]
+
+            for e in other:
+                attacker, target = (payload, e[3]) if side == self.ATTACKER else (e[3], payload)
+                pairs.setdefault(id(attacker), (attacker, []))[1].append(target)
+
+            open_sides[side].append(entry)
+        return pairs
+
+
+# Collision layers, one bit each
+PLAYER = 1 << 0
+ENEMY = 1 << 1
+HELPER = 1 << 2
+PLAYER_BULLET = 1 << 3
+ENEMY_BULLET = 1 << 4
+BOUNDS = 1 << 5  # the edge of the screen, has no hitboxes
+
+# order targets are tested in, a helper shields its boss
+LAYERS = (PLAYER, HELPER, ENEMY, PLAYER_BULLET, ENEMY_BULLET)
+
+
+class CollisionEvents:
+    """
+    A preallocated buffer of collision records.
+
+    Handles
+    """""""
+    * recording ``(attacker, target, kind, position)`` during detection
+    * handing the records back grouped by kind for resolution
+
+    ..note::
+        Detection only writes records, it never touches game state, so it
+        can be reordered or batched freely. ``kind`` is the code
+        ``CollisionWorld.on()`` gave the (attacker layer, target layer) pair.
+        The buffer doubles when full and keeps its size afterwards.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Pre-allocate the buffer.
+
+        :param capacity: records held before growing.
+        """
+        self.attackers: List[object] = [None] * capacity
+        self.targets: List[object] = [None] * capacity
+        self.kinds = np.zeros(capacity, dtype=np.int16)
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.count = 0
+
+    def push(self, attacker: object, target: object, kind: int, x: float, y: float) -> None:
+        """
+        Record one collision.
+
+        :param attacker: what hit, e.g. a bullet or a bullet slot.
+        :param target: what was hit.
+        :param kind: the pair's kind code.
+        :param x: where it happened.
+        :param y: where it happened.
+        :returns: None
+        """
+        i = self.count
+        if i == len(self.attackers):
+            self._grow(i + 1)
+
+        self.attackers[i] = attacker
+        self.targets[i] = target
+        self.kinds[i] = kind
+        self.positions[i] = x, y
+        self.count = i + 1
+
+    def extend(self, attackers: list, target: object, kind: int, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Record many collisions of one kind on one target.
+
+        :returns: None
+        """
+        n = len(attackers)
+        start = self.count
+        end = start + n
+        if end > len(self.attackers):
+            self._grow(end)
+
+        self.attackers[start:end] = attackers
+        self.targets[start:end] = [target] * n
+        self.kinds[start:end] = kind
+        self.positions[start:end, 0] = x
+        self.positions[start:end, 1] = y
+        self.count = end
+
+    def _grow(self, needed: int) -> None:
+        """
+        Double the buffer until it holds ``needed`` records.
+        """
+        capacity = len(self.attackers)
+        while capacity < needed:
+            capacity *= 2
+
+        extra = capacity - len(self.attackers)
+        self.attackers += [None] * extra
+        self.targets += [None] * extra
+        self.kinds = np.concatenate((self.kinds, np.zeros(extra, dtype=self.kinds.dtype)))
+        self.positions = np.concatenate((self.positions, np.zeros((extra, 2))))
+
+    def groups(self):
+        """
+        The records of this frame, grouped by kind, in recording order
+        within a kind.
+
+        :returns: an iterator of ``(kind, attackers, targets, positions)``
+        """
+        count = self.count
+        if count == 0:
+            return
+
+        kinds = self.kinds[:count]
+        order = np.argsort(kinds, kind="stable")
+        bounds = np.flatnonzero(np.diff(kinds[order])) + 1
+        for group in np.split(order, bounds):
+            idx = group.tolist()
+            yield (
+                int(kinds[group[0]]),
+                [self.attackers[i] for i in idx],
+                [self.targets[i] for i in idx],
+                self.positions[group],
+            )
+
+    def clear(self) -> None:
+        """
+        Forget the recorded collisions, keeping the buffer.
+
+        :returns: None
+        """
+        count = self.count
+        self.attackers[:count] = [None] * count
+        self.targets[:count] = [None] * count
+        self.count = 0
+
+
+class CollisionWorld:
+    """
+    Registry of collidable hitboxes, one flat list per layer.
+
+    Handles
+    """""""
+    * registering and unregistering hitboxes
+    * the (layer, layer) -> handler dispatch table
+    * the collision event buffer and its resolution pass
+    * dropping dead collidables
+
+    ..note::
+        Collidables carry ``layer``, their own bit, and ``mask``, the
+        layers they test against. Both are set at construction.
+        A registered hitbox is ``(owner, rect)``; the rect is the owner's
+        own and must be moved in place.
+    """
+
+    def __init__(self):
+        """
+        Initiate empty layers and an empty dispatch table.
+        """
+        self.layers: Dict[int, List[Tuple[object, pygame.Rect]]] = {layer: [] for layer in LAYERS}
+        self.kinds: Dict[Tuple[int, int], int] = {}
+        self.handlers: List[Callable[[list, list, np.ndarray], None]] = []
+        self._targets: Dict[Tuple[int, int], list] = {}
+        self.broadphase = SweepAndPrune()
+        self.events = CollisionEvents()
+
+    def register(self, owner: object, rect: pygame.Rect) -> None:
+        """
+        Add a hitbox to its owner's layer.
+
+        :param owner: a collidable with ``layer`` and ``is_dead``.
+        :param rect: the owner's hitbox.
+        :returns: None
+        """
+        hitboxes = self.layers[owner.layer]
+        if all(other is not owner for other, _ in hitboxes):
+            hitboxes.append((owner, rect))
+
+    def unregister(self, owner: object) -> None:
+        """
+        Remove an owner's hitbox, if registered.
+
+        :param owner: a registered collidable.
+        :returns: None
+        """
+        hitboxes = self.layers[owner.layer]
+        hitboxes[:] = [hitbox for hitbox in hitboxes if hitbox[0] is not owner]
+
+    def on(self, layer: int, other: int, handler: Callable[[list, list, np.ndarray], None]) -> int:
+        """
+        Route hits of ``layer`` on ``other`` to
+        ``handler(attackers, targets, positions)``.
+
+        :param layer: the attacker's layer.
+        :param other: the target's layer.
+        :param handler: resolves every hit of the pair in a frame at once.
+        :returns: the pair's kind code
+        """
+        kind = self.kinds.get((layer, other))
+        if kind is None:
+            kind = self.kinds[(layer, other)] = len(self.handlers)
+            self.handlers.append(handler)
+        else:
+            self.handlers[kind] = handler
+        self._targets.clear()
+        return kind
+
+    def targets(self, layer: int, mask: int) -> List[Tuple[list, int]]:
+        """
+        The hitbox lists an attacker tests against, with their kind codes.
+
+        :param layer: the attacker's layer.
+        :param mask: the layers the attacker collides with.
+        :returns: ``(hitboxes, kind)`` pairs in ``LAYERS`` order
+        """
+        key = (layer, mask)
+        if key not in self._targets:
+            self._targets[key] = [
+                (self.layers[other], self.kinds[(layer, other)])
+                for other in LAYERS
+                if mask & other and (layer, other) in self.kinds
+            ]
+        return self._targets[key]
+
+    def sweep(self, attackers: list, layer: int, mask: int) -> Dict[int, Tuple[object, list]]:
+        """
+        Pair attackers with the hitboxes their x span overlaps.
+
+        :param attackers: collidables of ``layer`` with an ``x_span()`` method.
+        :param layer: the attackers' layer.
+        :param mask: the layers the attackers collide with.
+        :returns: ``{id(attacker): (attacker, candidates)}``, the candidates
+            as ``(rank, order, target, rect, kind)`` in testing order
+        """
+        items = []
+        for rank, (hitboxes, kind) in enumerate(self.targets(layer, mask)):
+            for order, (target, rect) in enumerate(hitboxes):
+                items.append((
+                    id(target), rect.left, rect.right, SweepAndPrune.TARGET,
+                    (rank, order, target, rect, kind),
+                ))
+        for attacker in attackers:
+            left, right = attacker.x_span()
+            items.append((id(attacker), left, right, SweepAndPrune.ATTACKER, attacker))
+
+        pairs = self.broadphase.pairs(items)
+        for _, candidates in pairs.values():
+            candidates.sort(key=itemgetter(0, 1))
+        return pairs
+
+    def resolve(self) -> None:
+        """
+        Hand this frame's collision records to their handlers, one call
+        per kind, and empty the buffer.
+
+        :returns: None
+        """
+        for kind, attackers, targets, positions in self.events.groups():
+            self.handlers[kind](attackers, targets, positions)
+        self.events.clear()
+
+    def prune(self) -> None:
+        """
+        Unregister every dead collidable.
+
+        :returns: None
+        """
+        for hitboxes in self.layers.values():
+            if any(owner.is_dead for owner, _ in hitboxes):
+                hitboxes[:] = [hitbox for hitbox in hitboxes if not hitbox[0].is_dead]
@@ -0,0 +1,257 @@
+from typing import Callable, Dict, List, Tuple
+
+import pygame
+
+
+class TextCache:
+    """
+    Fonts and rendered text, made once and handed out again.
+
+    Handles
+    """""""
+    * one font object per (name, size)
+    * one text surface per (text, size, colors)
+    * dropping the oldest text once ``capacity`` is reached
+    * one surface per glyph, for text that changes every frame
+
+    ..note::
+        ``pygame.font.SysFont`` looks the font up on disk every call and
+        ``Font.render`` rasterizes the whole string, so neither should run
+        per frame. Text that never repeats, like a counter, would render
+        and evict an entry every frame, so it is put together from cached
+        glyphs with ``blit`` instead.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initiate an empty cache.
+
+        :param capacity: most text surfaces kept.
+        """
+        self.capacity = capacity
+        self.fonts: Dict[Tuple, pygame.font.Font] = {}
+        self.texts: Dict[Tuple, pygame.Surface] = {}
+        self.glyphs: Dict[Tuple, pygame.Surface] = {}
+
+    def font(self, size: int, name: str | None = None) -> pygame.font.Font:
+        """
+        The system font ``name`` at ``size``.
+
+        :param size: point size.
+        :param name: system font name, ``None`` for pygame's default.
+        :returns: pygame.font.Font
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def render(
+        self,
+        text: str,
+        size: int,
+        color: Tuple[int, int, int],
+        background: Tuple[int, int, int] | None = None,
+        name: str | None = None,
+    ) -> pygame.Surface:
+        """
+        ``text`` rendered without antialiasing, cached.
+
+        :param text: the string.
+        :param size: point size.
+        :param color: text color.
+        :param background: fill behind the text, ``None`` for transparent.
+        :param name: system font name.
+        :returns: a surface that must not be drawn onto
+        """
+        key = (text, size, color, background, name)
+        surface = self.texts.get(key)
+        if surface is None:
+            if len(self.texts) >= self.capacity:
+                del self.texts[next(iter(self.texts))]
+            surface = self.font(size, name).render(text, False, color, background)
+            self.texts[key] = surface
+        return surface
+
+    def blit(
+        self,
+        surf: pygame.Surface,
+        text: str,
+        pos: Tuple[int, int],
+        size: int,
+        color: Tuple[int, int, int],
+        background: Tuple[int, int, int] | None = None,
+        name: str | None = None,
+    ) -> pygame.Rect:
+        """
+        Draw ``text`` onto ``surf`` one cached glyph at a time.
+
+        :param surf: the surface to draw onto.
+        :param text: the string.
+        :param pos: top left of the text.
+        :param size: point size.
+        :param color: text color.
+        :param background: fill behind the text, ``None`` for transparent.
+        :param name: system font name.
+        :returns: the area drawn
+
+        ..note::
+            Glyphs are placed side by side without kerning, which the
+            unantialiased HUD fonts don't use anyway.
+        """
+        x, y = pos
+        area = pygame.Rect(pos, (0, 0))
+        for char in text:
+            key = (char, size, color, background, name)
+            glyph = self.glyphs.get(key)
+            if glyph is None:
+                glyph = self.font(size, name).render(char, False, color, background)
+                self.glyphs[key] = glyph
+            area.union_ip(surf.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return area
+
+
+class Widget:
+    """
+    A HUD element redrawn only when the value it shows changes.
+
+    Handles
+    """""""
+    * change detection
+    * drawing through a callback
+    """
+
+    def __init__(self, rect: pygame.Rect, value: Callable[[], object], draw: Callable | None = None):
+        """
+        Initiate the widget.
+
+        :param rect: the HUD area the widget draws in.
+        :param value: returns what the widget shows.
+        :param draw: ``draw(surf)``, draws the widget onto the HUD surface.
+        """
+        self.rect = pygame.Rect(rect)
+        self.value = value
+        self.draw_func = draw
+        self.shown = None
+        self.stale = True
+
+    def changed(self) -> bool:
+        """
+        Whether the value moved since it was last drawn.
+
+        :returns: bool
+        """
+        value = self.value()
+        if self.stale or value != self.shown:
+            self.shown = value
+            self.stale = False
+            return True
+        return False
+
+    def draw(self, surf: pygame.Surface) -> None:
+        """
+        Draw the widget, may move ``rect`` to the area drawn.
+
+        :param surf: the HUD surface.
+        :returns: None
+        """
+        self.draw_func(surf)
+
+
+class Label(Widget):
+    """
+    A line of cached text.
+    """
+
+    def __init__(
+        self,
+        pos: Tuple[int, int],
+        value: Callable[[], object],
+        text: str,
+        cache: TextCache,
+        size: int = 12,
+        color: Tuple[int, int, int] = (200, 200, 200),
+        background: Tuple[int, int, int] | None = None,
+        glyphs: bool = False,
+    ):
+        """
+        Initiate the label.
+
+        :param pos: top left of the text.
+        :param value: returns what the label shows.
+        :param text: format string the value is put into, e.g. ``"hp: {}"``.
+        :param cache: where fonts and text surfaces come from.
+        :param size: point size.
+        :param color: text color.
+        :param background: fill behind the text.
+        :param glyphs: draw from cached glyphs, for values that rarely repeat.
+        """
+        super().__init__(pygame.Rect(pos, (0, 0)), value)
+        self.text = text
+        self.cache = cache
+        self.size = size
+        self.color = color
+        self.background = background
+        self.glyphs = glyphs
+
+    def draw(self, surf: pygame.Surface) -> None:
+        text = self.text.format(self.shown)
+        if self.glyphs:
+            self.rect = self.cache.blit(
+                surf, text, self.rect.topleft, self.size, self.color, self.background
+            )
+            return
+
+        text = self.cache.render(text, self.size, self.color, self.background)
+        self.rect = surf.blit(text, self.rect.topleft)
+
+
+class Hud:
+    """
+    Screen-space widgets kept on one persistent surface.
+
+    Handles
+    """""""
+    * redrawing the widgets whose value changed
+    * compositing the HUD in one blit
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        """
+        Initiate an empty HUD.
+
+        :param size: the size of the surface the HUD is drawn over.
+        """
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.widgets: List[Widget] = []
+
+    def add(self, widget: Widget) -> Widget:
+        """
+        Show ``widget`` from the next update on.
+
+        :returns: the widget
+        """
+        self.widgets.append(widget)
+        return widget
+
+    def update(self) -> None:
+        """
+        Clear and redraw every widget whose value changed.
+
+        :returns: None
+        """
+        for widget in self.widgets:
+            if widget.changed():
+                self.surface.fill((0, 0, 0, 0), widget.rect)
+                widget.draw(self.surface)
+
+    def render(self, surf: pygame.Surface) -> None:
+        """
+        Composite the HUD onto ``surf``.
+
+        :param surf: The Pygame surface to draw onto.
+        :returns: None
+        """
+        surf.blit(self.surface, (0, 0))
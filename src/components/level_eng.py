@@ -1,7 +1,7 @@
 import pygame
 import math, random 
 
-from components.pattern import PatternEngine
+from components.pattern import PatternEngine, compile_patterns
 from entities.entity import WorkerBee, Life
 from entities.enemy_comp import WorkerAi, MonstersGun
 
@@ -22,7 +22,7 @@ class SpawnEvent:
         self.hp = hp 
         self.formation = formation
         self.count = count
-        self.patterns = patterns or [] #TODO 
+        self.patterns = compile_patterns(patterns or [])  # compiled once, shared by the spawns
         self.triggered = False
 
 
@@ -51,6 +51,9 @@ class StageTimeline:
 
     def execute(self, event):
         formation = event.formation
+
+        # bullet pool telemetry is recorded per spawn event
+        self.game.monster_bullets.set_stage(f"{event.enemy_type}@{event.trigger}")
         
         for i in range(event.count):
             spawn_pos = formation.get_position(i)
@@ -59,9 +62,8 @@ class StageTimeline:
             size = event.size
             hp = event.hp
             
-            for pattern_name, kwargs in event.patterns:
-                pattern_func = getattr(pattern_engine, pattern_name)
-                pattern_engine.add_pattern(pattern_func, **kwargs)
+            for program in event.patterns:
+                pattern_engine.add_program(program)
 
             #combat = MonstersGun()
 
@@ -1,99 +1,299 @@
+import heapq
+import inspect
 import math
+import numpy as np
 import pygame
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple, Tuple
+
+from config.bullet_config import BULLET_POOLS
+
+# per-bullet behavior kernels a pattern passes through to its bullets
+BEHAVIORS = ("accel", "ang_vel", "homing", "delay")
+
+
+def behavior(kwargs):
+    """
+    Pick the behavior kernel parameters out of a pattern's kwargs.
+    """
+    return {key: kwargs[key] for key in BEHAVIORS if key in kwargs}
+
+
+# --------------------------------------------------
+# DIRECTION TABLES
+# --------------------------------------------------
+# angles of one emission, from the fixed pattern kwargs. directed and
+# spiral angles are offsets, rotated by their base angle on every fire.
+
+def ring_angles(n_bullets=12, **kwargs):
+    return (2 * np.pi / n_bullets) * np.arange(n_bullets)
+
+
+def spray_angles(angle_deg, n, spread, **kwargs):
+    start = angle_deg - spread / 2
+    return np.radians(start + np.arange(n) * (spread / max(1, n - 1)))
+
+
+def stack_angles(angle_deg, n, **kwargs):
+    return np.full(n, math.radians(angle_deg))
+
+
+def directed_angles(n, spread=20, **kwargs):
+    if n == 1:
+        return np.zeros(1)
+    return (np.arange(n) - (n - 1) / 2) * (math.radians(spread) / max(1, n - 1))
+
+
+def spiral_angles(n, angle_deg=90, spread=5, **kwargs):
+    base = math.radians(angle_deg)
+    if n == 1:
+        return np.full(1, base)
+    start = base - math.radians(spread) / 2
+    return start + np.arange(n) * (math.radians(spread) / (n - 1))
+
+
+ANGLE_TABLES = {
+    "ring": ring_angles,
+    "spray": spray_angles,
+    "stack": stack_angles,
+    "directed": directed_angles,
+    "spiral": spiral_angles,
+}
+
+
+class PatternProgram(NamedTuple):
+    """
+    A compiled pattern spec, shared by every shooter that uses it.
+
+    ..note::
+        Built by ``compile_pattern()``. The kwargs are read-only and the
+        direction table arrays are not writeable.
+    """
+
+    name: str
+    func: Callable  # the ``PatternEngine`` method, unbound
+    kwargs: Mapping
+    interval: float  # seconds between fires
+    table: Tuple[np.ndarray, np.ndarray, np.ndarray]  # angle, dir_x, dir_y
 
 
 class PatternInstance:
-    def __init__(self, func, kwargs):
-        self.func = func
-        self.kwargs = kwargs
-        self.cooldown = 0.0
+    def __init__(self, engine, program):
+        self.engine = engine
+        self.program = program
+        self.interval = program.interval
+        self.table = program.table
+        self.phase = 0.0  # spiral rotation
+        self.cancelled = False
+        self.held = True  # waiting for its owner to be able to fire
+
+    def rotated(self, angle):
+        """
+        A copy of the direction table turned by ``angle`` radians.
+        """
+        angles, dir_x, dir_y = self.table
+        c, s = math.cos(angle), math.sin(angle)
+        return angles + angle, dir_x * c - dir_y * s, dir_x * s + dir_y * c
+
+    def fire(self):
+        self.program.func(self.engine, _pattern=self, **self.program.kwargs)
+
+
+class PatternScheduler:
+    """
+    Global fire scheduler for every pattern in the game.
+
+    Handles
+    """""""
+    * a heap of patterns keyed on their next fire time
+    * waking only the patterns due this frame
+    * parking patterns while their owner can't shoot
+
+    ..note::
+        A pattern is due ``interval`` seconds after it last fired. If its
+        owner can't fire when it is due (off screen, inactive helper) it is
+        held: taken off the heap and parked until the owner calls ``wake``
+        as it becomes able to fire. Waking restarts the cooldown, so the
+        next shot comes a full interval after the wake, however long the
+        pattern was parked. New patterns start out held.
+        Patterns of dead owners are dropped. Nothing fires during a phase
+        transition.
+    """
+
+    def __init__(self, game):
+        """
+        Initiate an empty schedule.
+
+        :param game: the main game engine instance.
+        """
+        self.game = game
+        self.now = 0.0
+        self.heap = []
+        self.counter = 0  # tie breaker, keeps equal times in schedule order
+        self.parked = {}  # owner: [(engine, pattern)] held until ``wake(owner)``
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, engine, pattern, delay):
+        """
+        Wake ``pattern`` of ``engine`` in ``delay`` seconds.
+        """
+        heapq.heappush(self.heap, (self.now + delay, self.counter, engine, pattern))
+        self.counter += 1
+
+    def park(self, engine, pattern):
+        """
+        Hold ``pattern`` off the heap until its owner wakes it.
+        """
+        owner = engine.owner
+        pattern.held = True
+        if owner not in self.parked:
+            # forget owners that died with patterns parked
+            for dead in [o for o in self.parked if o.is_dead]:
+                del self.parked[dead]
+        self.parked.setdefault(owner, []).append((engine, pattern))
+
+    def wake(self, owner):
+        """
+        Put the patterns parked for ``owner`` back on the heap, a full
+        interval out. Owners call it when they become able to fire.
+        """
+        for engine, pattern in self.parked.pop(owner, ()):
+            if not pattern.cancelled:
+                pattern.held = False
+                self.schedule(engine, pattern, pattern.interval)
 
     def update(self, dt):
-        self.cooldown += dt
-        self.func(dt=dt, _pattern=self, **self.kwargs)
+        """
+        Advance the clock and fire every pattern that came due.
+
+        :param dt: delta time
+        :returns: None
+        """
+        self.now += dt
+        if self.game.transition_sys.active:
+            return
+
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            _, _, engine, pattern = heapq.heappop(heap)
+            if pattern.cancelled or engine.owner.is_dead:
+                continue
+
+            if not engine.owner.can_fire():
+                self.park(engine, pattern)
+            elif pattern.held:
+                pattern.held = False
+                self.schedule(engine, pattern, pattern.interval)
+            else:
+                pattern.fire()
+                self.schedule(engine, pattern, pattern.interval)
 
 
 class PatternEngine:
     def __init__(self):
-        self.owner = None
+        self._owner = None
         self.active_pattern = []
 
+    @property
+    def owner(self):
+        return self._owner
+
+    @owner.setter
+    def owner(self, owner):
+        # patterns start their clock once the engine has a shooter
+        first = self._owner is None
+        self._owner = owner
+        if first and owner is not None:
+            for pattern in self.active_pattern:
+                self._start(pattern)
+
     def add_pattern(self, pattern_func, **kwargs):
-        self.active_pattern.append(PatternInstance(pattern_func, kwargs))
+        self.add_program(compile_pattern((pattern_func.__name__, kwargs)))
 
-    def execute_patterns(self, dt):
-        if self.owner.game.transition_sys.active:
-            return
+    def add_program(self, program):
+        pattern = PatternInstance(self, program)
+        self.active_pattern.append(pattern)
+        if self._owner is not None:
+            self._start(pattern)
 
+    def clear(self):
         for pattern in self.active_pattern:
-            pattern.update(dt)
+            pattern.cancelled = True
+        self.active_pattern.clear()
+
+    def _start(self, pattern):
+        # held, so the first interval runs from when the owner can fire
+        self._owner.game.pattern_scheduler.schedule(self, pattern, 0.0)
 
     # --------------------------------------------------
     # PATTERNS
     # --------------------------------------------------
 
     def ring(
-        self, radius=20, n_bullets=12, speed=2, spread_rate=0.5, _pattern=None, **kwargs
+        self,
+        radius=20,
+        n_bullets=12,
+        speed=2,
+        spread_rate=0.5,
+        design=None,
+        _pattern=None,
+        **kwargs
     ):
-        if _pattern.cooldown < spread_rate:
-            return
-
-        # a reference to the pattern object
-        _pattern.cooldown = 0.0
-
-        bullets = [b for b in self.owner.game.monster_bullets if not b.active][
-            :n_bullets
-        ]
-        if not bullets:
-            return
-
-        cx, cy = self.owner.rect.center
-
-        for i, bullet in enumerate(bullets):
-            angle = (2 * math.pi / n_bullets) * i
-            bullet.activate(center=(cx, cy), angle=angle, speed=speed, radius=radius)
+        self.owner.game.monster_bullets.queue(
+            n_bullets,
+            design,
+            center=self.owner.rect.center,
+            directions=_pattern.table,
+            speed=speed,
+            radius=radius,
+            **behavior(kwargs)
+        )
 
     def spray(
-        self, angle_deg, n, spread, speed, spread_rate=0.3, _pattern=None, **kwargs
+        self,
+        angle_deg,
+        n,
+        spread,
+        speed,
+        spread_rate=0.3,
+        design=None,
+        _pattern=None,
+        **kwargs
     ):
         # angle_deg is the direction
 
-        if _pattern.cooldown < spread_rate:
-            return
-
-        _pattern.cooldown = 0.0
-
-        bullets = [b for b in self.owner.game.monster_bullets if not b.active][:n]
-        if not bullets:
-            return
-
-        cx, cy = self.owner.rect.center
-        start = angle_deg - spread / 2
-
-        for i, bullet in enumerate(bullets):
-            angle = math.radians(start + i * (spread / max(1, n - 1)))
-            bullet.activate(center=(cx, cy), angle=angle, speed=speed, radius=0)
-
-    def stack(self, angle_deg, n, speed, spread_rate=0.4, _pattern=None, **kwargs):
-        if _pattern.cooldown < spread_rate:
-            return
-
-        _pattern.cooldown = 0.0
-
-        bullets = [
-            b
-            for b in self.owner.game.monster_bullets
-            if not b.active and b.id == "yellow"
-        ][:n]
-
-        if not bullets:
-            return
-
-        cx, cy = self.owner.rect.center
-        angle = math.radians(angle_deg)
+        self.owner.game.monster_bullets.queue(
+            n,
+            design,
+            center=self.owner.rect.center,
+            directions=_pattern.table,
+            speed=speed,
+            radius=0,
+            **behavior(kwargs)
+        )
 
-        for i, bullet in enumerate(bullets):
-            bullet.activate(center=(cx, cy), angle=angle, speed=speed - i, radius=0)
+    def stack(
+        self,
+        angle_deg,
+        n,
+        speed,
+        spread_rate=0.4,
+        design="yellow",
+        _pattern=None,
+        **kwargs
+    ):
+        # one direction, each bullet a step slower than the last
+        self.owner.game.monster_bullets.queue(
+            n,
+            design,
+            center=self.owner.rect.center,
+            directions=_pattern.table,
+            speed=speed - np.arange(n),
+            radius=0,
+            **behavior(kwargs)
+        )
 
     # TODO !!!
     def directed(
@@ -102,23 +302,10 @@ class PatternEngine:
         speed,
         spread=20,  # optional cone spread
         spread_rate=0.4,
+        design="blue",
         _pattern=None,
         **kwargs
     ):
-        if _pattern.cooldown < spread_rate:
-            return
-
-        _pattern.cooldown = 0.0
-
-        bullets = [
-            b
-            for b in self.owner.game.monster_bullets
-            if not b.active and b.id == "blue"
-        ][:n]
-
-        if not bullets:
-            return
-
         # Snapshot position once (important!)
         shooter_pos = pygame.Vector2(self.owner.rect.center)
         player_pos = pygame.Vector2(self.owner.game.player.pos)
@@ -128,20 +315,16 @@ class PatternEngine:
             player_pos.y - shooter_pos.y, player_pos.x - shooter_pos.x
         )
 
-        spread_rad = math.radians(spread)
-
-        for i, bullet in enumerate(bullets):
-            # Optional small spread cone
-            if n > 1:
-                offset = (i - (n - 1) / 2) * (spread_rad / max(1, n - 1))
-            else:
-                offset = 0
-
-            final_angle = base_angle + offset
-
-            bullet.activate(
-                center=shooter_pos, angle=final_angle, speed=speed, radius=0
-            )
+        # the cone table is centred on 0, turn it towards the player
+        self.owner.game.monster_bullets.queue(
+            n,
+            design,
+            center=shooter_pos,
+            directions=_pattern.rotated(base_angle),
+            speed=speed,
+            radius=0,
+            **behavior(kwargs)
+        )
 
     def spiral(
         self,
@@ -151,6 +334,7 @@ class PatternEngine:
         spread=5,  # degrees
         rotation_speed=120,  # degrees per second
         spread_rate=0.3,
+        design=None,
         _pattern=None,
         **kwargs
     ):
@@ -159,33 +343,78 @@ class PatternEngine:
         Continuously rotates the firing direction over time.
         """
 
-        if _pattern.cooldown < spread_rate:
-            return
-
-        _pattern.cooldown = 0.0
-
-        # --- initialize spiral state ---
-        if not hasattr(_pattern, "phase"):
-            _pattern.phase = 0.0
-
         # rotate over time (frame independent)
         _pattern.phase += math.radians(rotation_speed) * spread_rate
 
-        bullets = [b for b in self.owner.game.monster_bullets if not b.active][:n]
-
-        if not bullets:
-            return
-
-        cx, cy = self.owner.rect.center
-
-        # apply rotation to base angle
-        base_angle = math.radians(angle_deg) + _pattern.phase
-        start = base_angle - math.radians(spread) / 2
+        # the table already holds angle_deg and the spread, only the phase turns
+        self.owner.game.monster_bullets.queue(
+            n,
+            design,
+            center=self.owner.rect.center,
+            directions=_pattern.rotated(_pattern.phase),
+            speed=speed,
+            radius=0,
+            **behavior(kwargs)
+        )
 
-        for i, bullet in enumerate(bullets):
-            if n > 1:
-                angle = start + i * (math.radians(spread) / (n - 1))
-            else:
-                angle = base_angle
 
-            bullet.activate(center=(cx, cy), angle=angle, speed=speed, radius=0)
+# --------------------------------------------------
+# COMPILER
+# --------------------------------------------------
+
+def compile_pattern(spec) -> PatternProgram:
+    """
+    Validate a ``(name, kwargs)`` pattern spec and precompute what it needs.
+
+    :param spec: a pattern spec as written in the level and boss configs.
+    :returns: PatternProgram
+    :raises ValueError: if the spec can't be fired as written.
+    """
+    try:
+        name, kwargs = spec
+        kwargs = dict(kwargs)
+    except (TypeError, ValueError):
+        raise ValueError(f"pattern spec must be (name, kwargs), got {spec!r}") from None
+
+    if name not in ANGLE_TABLES:
+        raise ValueError(f"unknown pattern {name!r}, expected one of {sorted(ANGLE_TABLES)}")
+
+    func = getattr(PatternEngine, name)
+    params = {
+        key: param.default
+        for key, param in inspect.signature(func).parameters.items()
+        if key not in ("self", "_pattern") and param.kind is param.POSITIONAL_OR_KEYWORD
+    }
+
+    unknown = set(kwargs) - set(params) - set(BEHAVIORS)
+    if unknown:
+        raise ValueError(f"pattern {name!r}: unknown parameters {sorted(unknown)}")
+    missing = [key for key, default in params.items() if default is inspect.Parameter.empty and key not in kwargs]
+    if missing:
+        raise ValueError(f"pattern {name!r}: missing parameters {missing}")
+
+    bound = {**params, **kwargs}
+    for key in ("n", "n_bullets"):
+        if key in bound and not (isinstance(bound[key], int) and bound[key] >= 1):
+            raise ValueError(f"pattern {name!r}: {key} must be a positive int, got {bound[key]!r}")
+    if not bound["spread_rate"] > 0:
+        raise ValueError(f"pattern {name!r}: spread_rate must be positive, got {bound['spread_rate']!r}")
+    if bound["design"] is not None and bound["design"] not in BULLET_POOLS:
+        raise ValueError(f"pattern {name!r}: unknown design {bound['design']!r}")
+
+    angles = ANGLE_TABLES[name](**bound)
+    table = (angles, np.cos(angles), np.sin(angles))
+    for array in table:
+        array.flags.writeable = False
+
+    return PatternProgram(name, func, MappingProxyType(kwargs), bound["spread_rate"], table)
+
+
+def compile_patterns(specs) -> Tuple[PatternProgram, ...]:
+    """
+    Compile a list of pattern specs.
+
+    :param specs: ``(name, kwargs)`` pairs.
+    :returns: a tuple of PatternProgram
+    """
+    return tuple(compile_pattern(spec) for spec in specs)
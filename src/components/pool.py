@@ -0,0 +1,84 @@
+from typing import Callable, List
+
+
+class ObjectPool:
+    """
+    A pre-allocated pool of reusable objects.
+
+    Handles
+    """""""
+    * reset-on-acquire
+    * O(1) release
+    * allocation counting
+
+    ..note::
+        Pooled objects implement ``reset(*args)``, which must put them back
+        in the state a fresh object built with the same arguments would have.
+    """
+
+    def __init__(self, factory: Callable[[], object], size: int):
+        """
+        Pre-allocate the pool.
+
+        :param factory: builds one pooled object.
+        :param size: number of objects created up front.
+        """
+        self.factory = factory
+        self.free: List[object] = [factory() for _ in range(size)]
+        self.live: List[object] = []
+
+        # objects created after the pre-allocation ran dry
+        self.allocations = 0
+        self.frame_allocations = 0
+
+    def acquire(self, *args, **kwargs) -> object:
+        """
+        Hand out a free object, reset with ``args``.
+
+        :returns: the pooled object
+        """
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.factory()
+            self.allocations += 1
+            self.frame_allocations += 1
+
+        obj.pool_slot = len(self.live)
+        self.live.append(obj)
+        obj.reset(*args, **kwargs)
+        return obj
+
+    def release(self, obj: object) -> None:
+        """
+        Give an object back to the pool.
+
+        :param obj: an object handed out by ``acquire()``.
+        :returns: None
+        """
+        slot = obj.pool_slot
+        last = self.live.pop()
+        if last is not obj:
+            self.live[slot] = last
+            last.pool_slot = slot
+        self.free.append(obj)
+
+    def sweep(self, finished: Callable[[object], bool]) -> None:
+        """
+        Release every live object ``finished`` returns ``True`` for.
+
+        :param finished: predicate over a live object.
+        :returns: None
+        """
+        # walking backwards, a swapped-in object has already been checked
+        for i in range(len(self.live) - 1, -1, -1):
+            if i < len(self.live) and finished(self.live[i]):
+                self.release(self.live[i])
+
+    def begin_frame(self) -> None:
+        """
+        Reset the per-frame allocation count.
+
+        :returns: None
+        """
+        self.frame_allocations = 0
@@ -0,0 +1,98 @@
+import time
+from typing import Tuple
+
+import pygame
+
+# Scaling modes
+NEAREST = "nearest"
+SCALE2X = "scale2x"
+SMOOTH = "smooth"
+SCALE_MODES = (NEAREST, SCALE2X, SMOOTH)
+
+
+class Presenter:
+    """
+    Puts the low resolution frame on the screen.
+
+    Handles
+    """""""
+    * upscaling without allocating a surface per frame
+    * screenshake as the offset of one blit
+    * timing the present on its own
+
+    ..note::
+        Without shake the frame is scaled straight onto the screen. With
+        shake it is scaled into ``frame``, made once, and blitted at the
+        offset. ``scale2x`` only doubles, so it needs a screen exactly
+        twice the size of the frame.
+    """
+
+    def __init__(self, screen: pygame.Surface, source: pygame.Surface, mode: str = NEAREST):
+        """
+        Initiate the present stage.
+
+        :param screen: the display surface.
+        :param source: the surface the game draws on.
+        :param mode: one of ``SCALE_MODES``.
+        """
+        if mode not in SCALE_MODES:
+            raise ValueError(f"unknown scale mode {mode!r}, expected one of {SCALE_MODES}")
+
+        size = screen.get_size()
+        width, height = source.get_size()
+        if mode == SCALE2X and size != (width * 2, height * 2):
+            raise ValueError(f"scale2x needs a {width * 2}x{height * 2} screen, got {size[0]}x{size[1]}")
+
+        self.screen = screen
+        self.mode = mode
+        self.size = size
+        self.frame = pygame.Surface(size, 0, source)
+
+        # Timing, in milliseconds
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.frames = 0
+
+    def scale(self, source: pygame.Surface, dest: pygame.Surface) -> None:
+        """
+        Scale ``source`` over the whole of ``dest``.
+
+        :returns: None
+        """
+        if self.mode == NEAREST:
+            pygame.transform.scale(source, self.size, dest)
+        elif self.mode == SCALE2X:
+            pygame.transform.scale2x(source, dest)
+        else:
+            pygame.transform.smoothscale(source, self.size, dest)
+
+    def present(self, source: pygame.Surface, offset: Tuple[float, float] = (0, 0)) -> None:
+        """
+        Scale ``source`` onto the screen, shifted by ``offset``, and flip.
+
+        :param source: the frame to show.
+        :param offset: the screenshake offset, in screen pixels.
+        :returns: None
+        """
+        start = time.perf_counter()
+
+        dx, dy = int(offset[0]), int(offset[1])
+        if dx or dy:
+            self.scale(source, self.frame)
+            self.screen.blit(self.frame, (dx, dy))
+        else:
+            self.scale(source, self.screen)
+        pygame.display.update()
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.total_ms += self.last_ms
+        self.frames += 1
+
+    @property
+    def average_ms(self) -> float:
+        """
+        Mean present time so far.
+
+        :returns: float
+        """
+        return self.total_ms / self.frames if self.frames else 0.0
@@ -0,0 +1,80 @@
+from typing import Dict, Iterable, List, Tuple
+
+import pygame
+
+
+class ScriptedInput:
+    """
+    A replayable stand-in for ``pygame.event.get``.
+
+    Handles
+    """""""
+    * handing out the key events scripted for each step
+    * quitting once the script runs out
+    * reading scripts from text files
+
+    ..note::
+        A script is a list of ``(step, type, key)`` entries, ``type`` being
+        ``pygame.KEYDOWN`` or ``pygame.KEYUP``. Each call hands back the
+        events of the next step, so the game sees exactly the same input on
+        every run. After ``steps`` calls a ``pygame.QUIT`` is handed back.
+    """
+
+    def __init__(self, script: Iterable[Tuple[int, int, int]] = (), steps: int | None = None):
+        """
+        Initiate the script.
+
+        :param script: ``(step, type, key)`` entries, in any order.
+        :param steps: how many steps to run before quitting, defaults to
+            one past the last scripted step. ``0`` never quits.
+        """
+        self.events: Dict[int, List[pygame.event.Event]] = {}
+        for step, kind, key in sorted(script, key=lambda e: e[0]):
+            self.events.setdefault(step, []).append(pygame.event.Event(kind, key=key))
+
+        if steps is None:
+            steps = max(self.events, default=0) + 1
+        self.steps = steps
+        self.step = 0
+
+    @classmethod
+    def load(cls, path: str, steps: int | None = None) -> "ScriptedInput":
+        """
+        Read a script file.
+
+        One event per line, ``<step> <down|up> <key name>``, e.g.
+        ``30 down space``. Blank lines and ``#`` comments are skipped.
+
+        :param path: the script file.
+        :param steps: see ``__init__``.
+        :returns: ScriptedInput
+        """
+        kinds = {"down": pygame.KEYDOWN, "up": pygame.KEYUP}
+        script = []
+
+        with open(path) as f:
+            for n, line in enumerate(f, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+
+                try:
+                    step, kind, name = line.split(maxsplit=2)
+                    script.append((int(step), kinds[kind], pygame.key.key_code(name)))
+                except (KeyError, ValueError):
+                    raise ValueError(f"{path}:{n}: can't read {line!r}")
+
+        return cls(script, steps)
+
+    def __call__(self) -> List[pygame.event.Event]:
+        """
+        The events of the next step.
+
+        :returns: a list of events
+        """
+        step = self.step
+        self.step += 1
+
+        if self.steps and step >= self.steps:
+            return [pygame.event.Event(pygame.QUIT)]
+        return self.events.get(step, [])
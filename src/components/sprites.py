@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+
+class SpriteCache:
+    """
+    Prerendered solid-color sprites, least recently used dropped first.
+
+    Handles
+    """""""
+    * one surface per (size, color)
+    * converting surfaces to the display format
+    * evicting once ``capacity`` is reached
+
+    ..note::
+        Sprites are shared between everyone asking for the same size and
+        color, so they must not be drawn onto.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initiate an empty cache.
+
+        :param capacity: most sprites kept.
+        """
+        self.capacity = capacity
+        self.sprites: OrderedDict[Tuple, pygame.Surface] = OrderedDict()
+
+        # sprites that had to be made
+        self.misses = 0
+
+    def get(self, size: Tuple[int, int], color: Tuple[int, ...]) -> pygame.Surface:
+        """
+        A ``size`` surface filled with ``color``.
+
+        :param size: width and height.
+        :param color: RGB or RGBA.
+        :returns: pygame.Surface
+        """
+        key = (tuple(size), tuple(color))
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        if len(self.sprites) >= self.capacity:
+            self.sprites.popitem(last=False)
+
+        sprite = self.sprites[key] = self._make(size, color)
+        return sprite
+
+    def _make(self, size: Tuple[int, int], color: Tuple[int, ...]) -> pygame.Surface:
+        """
+        Build and convert one sprite.
+        """
+        sprite = pygame.Surface(size, pygame.SRCALPHA)
+        sprite.fill(color)
+
+        # display format blits fastest, opaque sprites need no per-pixel alpha
+        if pygame.display.get_surface() is not None:
+            opaque = len(color) < 4 or color[3] == 255
+            sprite = sprite.convert() if opaque else sprite.convert_alpha()
+        return sprite
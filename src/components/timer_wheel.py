@@ -0,0 +1,98 @@
+from typing import List, Tuple
+
+
+class TimerWheel:
+    """
+    A hierarchical timer wheel keyed on integer ticks.
+
+    Handles
+    """""""
+    * O(1) scheduling
+    * handing back everything due on a tick in one list
+    * cascading far timers down as their time gets close
+
+    ..note::
+        Level ``n`` has ``2**bits`` slots of ``2**(bits*n)`` ticks each. A timer
+        sits in the lowest level that can hold its delay and moves down a
+        level each time the level above wraps onto its slot. Timers further
+        out than the top level wait in ``overflow``.
+
+        Cancelling is lazy: the wheel may hand back items that were retired
+        or re-scheduled in the meantime, so callers check what they get.
+    """
+
+    def __init__(self, now: int = 0, bits: int = 6, levels: int = 3):
+        """
+        Initiate an empty wheel.
+
+        :param now: the current tick.
+        :param bits: log2 of the slots per level.
+        :param levels: number of levels.
+        """
+        self.now = now
+        self.bits = bits
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.levels = levels
+        self.wheels: List[List[List[Tuple[int, int]]]] = [
+            [[] for _ in range(self.size)] for _ in range(levels)
+        ]
+        self.overflow: List[Tuple[int, int]] = []
+
+    def schedule(self, item: int, expire: int) -> None:
+        """
+        Schedule ``item`` to be handed back on tick ``expire``.
+
+        :param item: the payload, e.g. a bullet slot.
+        :param expire: the tick it is due on, at least ``now + 1``.
+        :returns: None
+        """
+        self._place(item, max(expire, self.now + 1))
+
+    def _place(self, item: int, expire: int) -> None:
+        """
+        File a timer in the lowest level that can hold its delay.
+        """
+        delay = expire - self.now
+
+        level = 0
+        while level < self.levels and delay >= 1 << (self.bits * (level + 1)):
+            level += 1
+
+        if level == self.levels:
+            self.overflow.append((expire, item))
+            return
+
+        slot = (expire >> (self.bits * level)) & self.mask
+        self.wheels[level][slot].append((expire, item))
+
+    def tick(self) -> List[int]:
+        """
+        Advance one tick.
+
+        :returns: the items due on the new tick
+        """
+        self.now += 1
+        if self.now & self.mask == 0:
+            self._cascade(1)
+
+        slot = self.now & self.mask
+        due = self.wheels[0][slot]
+        self.wheels[0][slot] = []
+        return [item for _, item in due]
+
+    def _cascade(self, level: int) -> None:
+        """
+        Move the timers of the current slot of ``level`` down a level.
+        """
+        if level == self.levels:
+            pending, self.overflow = self.overflow, []
+        else:
+            slot = (self.now >> (self.bits * level)) & self.mask
+            if slot == 0:
+                self._cascade(level + 1)
+            pending = self.wheels[level][slot]
+            self.wheels[level][slot] = []
+
+        for expire, item in pending:
+            self._place(item, expire)
@@ -2,6 +2,10 @@ import pygame
 import math, random
 from typing import Tuple
 
+# camera shake draws from its own stream, so rendering or skipping it
+# never changes what the simulation's ``random`` hands out
+SHAKE_RANDOM = random.Random()
+
 class Spark:
     """
     Represents a particle used for collision and firing animation.
@@ -30,6 +34,25 @@ class Spark:
         
         # Physical Properties
         self.pos = pygame.math.Vector2(pos)
+        self.reset(pos, angle, speed, color)
+
+    def reset(
+        self,
+        pos: pygame.Vector2,
+        angle: float,
+        speed: float,
+        color: Tuple[int, int, int],
+    ) -> None:
+        """
+        Re-initiate a pooled particle in place.
+
+        :param pos: particle position.
+        :param angle: direction of the particle.
+        :param speed: the linear velocity.
+        :param color: the color of the particle
+        :returns: None
+        """
+        self.pos.update(pos)
         self.angle = angle
         self.speed = speed
         self.color = color
@@ -243,8 +266,8 @@ class Explosion:
         # camera shake offset
         cam = pygame.Vector2(0, 0)
         if self.camera_shake > 0:
-            cam.x = random.uniform(-1, 1) * self.camera_shake
-            cam.y = random.uniform(-1, 1) * self.camera_shake
+            cam.x = SHAKE_RANDOM.uniform(-1, 1) * self.camera_shake
+            cam.y = SHAKE_RANDOM.uniform(-1, 1) * self.camera_shake
 
         # draw shards under particles for depth
         for s in self.shards:
@@ -1,10 +1,12 @@
+from components.pattern import compile_patterns
+
 level = {
     'phase_1': {
         'hp_ratio': (0.66, 1.0),
         'movement': 'left_right',
         'helper': False,
         'patterns': [
-            ('stack', dict(angle_deg=90, n=3, speed=4, spread=45, spread_rate=1)),
+            ('stack', dict(angle_deg=90, n=3, speed=4, spread_rate=1)),
             ('spray', dict(angle_deg=90, n=5, speed=2, spread=45, spread_rate=0.8))
         ]
     },
@@ -30,3 +32,9 @@ level = {
         ]
     },
 }
+
+# patterns compiled once on import, so a bad phase spec fails at load
+BOSS_PHASES = {
+    key: dict(phase, patterns=compile_patterns(phase['patterns']))
+    for key, phase in level.items()
+}
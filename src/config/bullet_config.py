@@ -0,0 +1,22 @@
+# Monster bullet sub-pools, keyed by design id.
+#   capacity:     bullets pre-allocated for the design
+#   reserve:      free bullets kept back for patterns that ask for the design
+#   fallback:     designs to borrow from, in order, when the design runs out
+#   policy:       on exhaustion, 'drop' the shot, 'recycle' the oldest bullet or 'grow'
+#   ceiling:      the most bullets a growing pool may hold
+#   chunk:        bullets added per growth step and removed per shrink step
+#   shrink_after: seconds a grown pool must stay a chunk under its size before shrinking
+BULLET_POOLS = {
+    'purple': dict(
+        capacity=300, reserve=0, fallback=(),
+        policy='grow', ceiling=1200, chunk=100, shrink_after=5.0,
+    ),
+    'yellow': dict(
+        capacity=300, reserve=60, fallback=(),
+        policy='recycle',
+    ),
+    'blue': dict(
+        capacity=300, reserve=60, fallback=('purple',),
+        policy='grow', ceiling=600, chunk=50, shrink_after=5.0,
+    ),
+}
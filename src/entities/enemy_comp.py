@@ -1,6 +1,12 @@
 import pygame
 import math 
 import random
+
+from components.collision import HELPER, PLAYER_BULLET
+from components.pattern import PatternProgram, compile_pattern
+
+# helpers all shoot the same aimed single shot
+HELPER_PATTERN = compile_pattern(('directed', dict(n=1, speed=2, spread=45, spread_rate=0.5)))
  
 class PhaseMachine():
     """
@@ -14,13 +20,22 @@ class PhaseMachine():
         """
         Initiate Phase Configuration component.
         
-        :param level: a dictionary of configuration dictionary.
+        :param level: a dictionary of configuration dictionary, e.g.
+            ``BOSS_PHASES``. ``(name, kwargs)`` pattern specs are compiled
+            here, so a bad spec fails now rather than mid fight.
         :type level: dict
+        :raises ValueError: if a pattern spec can't be fired as written.
         """
 
         self.owner: object = None
-        self.level: dict = level
         self.currentPhase_key: dict = None
+        self.level: dict = {
+            key: dict(phase, patterns=tuple(
+                p if isinstance(p, PatternProgram) else compile_pattern(p)
+                for p in phase['patterns']
+            ))
+            for key, phase in level.items()
+        }
 
 
     def pick_phase(self) -> dict|None:
@@ -80,10 +95,9 @@ class MonsterAi:
         :type phase: dict
         """
 
-        self.pattern.active_pattern.clear()
-        for name, kwargs in phase['patterns']:
-            func = getattr(self.pattern, name)
-            self.pattern.add_pattern(func, **kwargs)
+        self.pattern.clear()
+        for program in phase['patterns']:
+            self.pattern.add_program(program)
 
         movement_pattern = phase['movement']
         func = getattr(self.movement_engine, movement_pattern)
@@ -103,7 +117,6 @@ class MonsterAi:
         """
         self.movement_pattern()
         self.movement_engine.update()
-        self.pattern.execute_patterns(dt)
         self.combat.update()
 
     def render(self, surf:pygame.Surface) -> None:
@@ -156,9 +169,6 @@ class WorkerAi:
 
         if self.movement_engine:
             self.movement_engine.update(dt)
-
-        if self.pattern and self.owner.is_visible():
-            self.pattern.execute_patterns(dt)
         
 
 class BossMovement:
@@ -220,20 +230,15 @@ class MonstersGun:
     def __init__(self):
         self.owner = None
 
-    def update(self, dt):
-        for b in self.owner.game.monster_bullets:
-            if b.active:
-                b.update(dt)
+    def update(self, dt=None):
+        # bullets are advanced by the game's BulletField, a phase
+        # transition wipes them, once per step
+        if self.owner.game.transition_sys.active:
+            self.owner.game.monster_bullets.clear()
 
     def render(self, surf):
-        if self.owner.game.transition_sys.active:
-            for b in self.owner.game.monster_bullets:
-                b.active = False 
-            return
-        
-        for b in self.owner.game.monster_bullets:
-            if b.active:
-                surf.blit(b.image, b.rect) #special_flags=pygame.BLEND_RGBA_ADD)
+        # bullets are drawn by the game, between fixed steps
+        pass
 
 
     
@@ -287,21 +292,28 @@ class Helper:
         self.pattern = pattern 
         self.life_stats = life 
 
+        # Hit by player bullets, registered while its monster is shielded
+        self.layer = HELPER
+        self.mask = PLAYER_BULLET
+
         if pattern:
             self.pattern.owner = self
-            #self.stack = PatternInstance(self.pattern.directed, dict(n=1, speed=2, spread=45, spread_rate=0.5)) # rename TODO
-            self.pattern.add_pattern(self.pattern.directed, **dict(n=1, speed=2, spread=45, spread_rate=0.5))
+            self.pattern.add_program(HELPER_PATTERN)
 
         if self.life_stats:
             self.life_stats.owner = self
             self.is_dead = self.life_stats.is_dead
 
+    def can_fire(self) -> bool:
+        """
+        Helpers only shoot while their monster has them up.
+        """
+        return self.active and not self.is_dead
+
     def update(self, dt):
         # LIFEBAR
         if self.active:
             self.life_stats.update()
-            # self.stack = PatternInstance(self.pattern.directed, dict(n=1, speed=2, spread=45, spread_rate=0.5)) # rename TODO
-            self.pattern.execute_patterns(dt)
 
         self.position = self.enemy.pos + self.offset
         self.rect.topleft = self.position
@@ -3,6 +3,7 @@ import math, random
 from typing import List, Tuple
 
 from components.visual import BloodParticles, Explosion
+from components.collision import PLAYER, ENEMY, PLAYER_BULLET, ENEMY_BULLET
 from components.pattern import PatternEngine
 from entities.enemy_comp import Helper
 
@@ -46,12 +47,17 @@ class Entity:
         self.game = game
         self.name = name
         self.pos = pygame.Vector2(pos)
+        self.prev_pos = pygame.Vector2(pos)  # pos at the start of the step
         self.size = size
         self.attack = attack
         self.is_dead = False
         self.death_particles = []
         self.bullets_group = None
 
+        # Collision layer and the layers it collides with
+        self.layer = 0
+        self.mask = 0
+
         # Visual representation
         self.original_color = color
         self.color = self.original_color
@@ -82,6 +88,14 @@ class Entity:
         """
         self.squash = 1.0
 
+    def can_fire(self) -> bool:
+        """
+        Whether the entity's patterns may shoot right now.
+
+        :returns: bool
+        """
+        return not self.is_dead
+
     def kill(self): #TODO ...
         # particle
         self.velocity = pygame.Vector2(0, 0)
@@ -107,21 +121,23 @@ class Entity:
             self.color = self.original_color
             self.flash_timer = 1
 
-    def render(self, surf: pygame.Surface) -> None:
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
         """
         Draw Entity on to screen.
         
         :param surf: The Pygame surface to draw onto.
+        :param alpha: how far between the last two steps to draw, 0 to 1.
         :returns: None
         """
 
         if self.is_dead:
             return
 
-        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-        self.image.fill(self.color)
+        self.image = self.game.sprites.get(self.rect.size, self.color)
 
-        surf.blit(self.image, self.rect)
+        # step back towards prev_pos, the rect itself stays where collision has it
+        offset = (self.prev_pos - self.pos) * (1 - alpha)
+        surf.blit(self.image, self.rect.move(round(offset.x), round(offset.y)))
 
 
 class Player(Entity):
@@ -171,6 +187,11 @@ class Player(Entity):
         self.collision_rect = pygame.Rect(0, 0, *self.collision_box)
         self.collision_rect.center = self.pos
 
+        # Hit by monster bullets
+        self.layer = PLAYER
+        self.mask = ENEMY_BULLET
+        self.game.collision.register(self, self.collision_rect)
+
         # colision effect 
         self.exploded = False
         self.invisible = False
@@ -185,6 +206,7 @@ class Player(Entity):
         self.squash = 0.0
         self.squash_return_speed = 8.0
         self.max_squash = 0.35
+        self.squash_frames = 4  # squash is drawn in this many steps
 
 
         # movement component
@@ -246,41 +268,40 @@ class Player(Entity):
 
         self.collision_rect.center = self.pos
 
+        # Apply squash & stretch: wider when shorter, thinner when taller
+        # quantized so only a few sprite sizes are ever drawn
+        squash = round(self.squash * self.squash_frames) / self.squash_frames
+        squash_amt = squash * self.max_squash 
+        height_scale = 1.0 - squash_amt
+        width_scale = 1.0 + squash_amt
+
+        new_w = int(self.size[0] * width_scale)
+        new_h = int(self.size[1] * height_scale)
+
+        # Ensure the player's 'feet' stay on the ground during squash
+        self.rect.size = (new_w, new_h)
+        self.rect.midbottom = self.collision_rect.midbottom
+
         # Update and clean up blood particles
         for b in self.blood_effect.copy():
             b.update()
 
-    def render(self, surf: pygame.Surface) -> None:
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
         """
         Draws the player.
 
         :param surf: The surface to draw the player onto.
+        :param alpha: how far between the last two steps to draw, 0 to 1.
         :returns: None
         """
-        self.life_stats.render(surf)
-
+        # the hit bar is drawn by the game's HUD
         for b in self.blood_effect.copy():
             b.render(surf)
 
-        super().render(surf)
-
-        if self.life_stats:
-            self.life_stats.render(surf)
+        super().render(surf, alpha)
 
         pygame.draw.rect(surf, (255,0,0), self.collision_rect) # collision_rect
 
-        # Apply squash & stretch: wider when shorter, thinner when taller
-        squash_amt = self.squash * self.max_squash 
-        height_scale = 1.0 - squash_amt
-        width_scale = 1.0 + squash_amt
-
-        new_w = int(self.size[0] * width_scale)
-        new_h = int(self.size[1] * height_scale)
-
-        # Ensure the player's 'feet' stay on the ground during squash
-        self.rect.size = (new_w, new_h)
-        self.rect.midbottom = self.collision_rect.midbottom
-
 
 class WorkerBee(Entity):
     """
@@ -331,6 +352,12 @@ class WorkerBee(Entity):
         self.rect = self.image.get_rect(center=self.pos)
 
         self.exploded = False
+        self.on_screen = False  # patterns are parked while off screen
+
+        # Hit by player bullets
+        self.layer = ENEMY
+        self.mask = PLAYER_BULLET
+        self.game.collision.register(self, self.rect)
 
         # Owner Wiring/ different approach
         def safe_set_owner(component):
@@ -350,6 +377,14 @@ class WorkerBee(Entity):
     def is_visible(self):
         return self.game.display.get_rect().colliderect(self.rect)
 
+    def can_fire(self) -> bool:
+        """
+        Worker bees hold fire until they are on screen.
+
+        :returns: bool
+        """
+        return not self.is_dead and self.is_visible()
+
     def update(self, dt: float) -> None:
         """
         Updates monster components.
@@ -375,14 +410,21 @@ class WorkerBee(Entity):
         self.monster_ai.update(dt)
         self.rect.center = self.pos
 
-    def render(self, surf: pygame.Surface) -> None:
+        # coming on screen wakes the patterns parked while it wasn't
+        on_screen = self.is_visible()
+        if on_screen and not self.on_screen:
+            self.game.pattern_scheduler.wake(self)
+        self.on_screen = on_screen
+
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
         """
         Draws the monster.
 
         :param surf: The surface to draw the player onto.
+        :param alpha: how far between the last two steps to draw, 0 to 1.
         :returns: None
         """
-        super().render(surf)
+        super().render(surf, alpha)
 
         if self.is_dead:
             return
@@ -449,6 +491,11 @@ class Monster(Entity):
         self.image = pygame.Surface(self.size, pygame.SRCALPHA)
         self.rect = self.image.get_rect(center=self.pos)
 
+        # Hit by player bullets, unless shielded by its helpers
+        self.layer = ENEMY
+        self.mask = PLAYER_BULLET
+        self.game.collision.register(self, self.rect)
+
         # components
         if ability:
             self.ability.owner = self
@@ -495,6 +542,8 @@ class Monster(Entity):
         super().update(dt)
 
         if self.is_dead:
+            if self.helpers_active:
+                self.set_helpers_active(False)
             self.game.game_over()
             return
 
@@ -507,13 +556,12 @@ class Monster(Entity):
 
         if phase_event is not None:
             self.game.transition_sys.start(self)
+            self.game.monster_bullets.set_stage(self.phase_machine.currentPhase_key)
             phase_dict = phase_event
             self.monster_ai.apply_phase(phase_dict)
 
             # activate helpers
-            self.helpers_active = phase_event["helper"]
-            self.left_helper.active = phase_event["helper"]
-            self.right_helper.active = phase_event["helper"]
+            self.set_helpers_active(phase_event["helper"])
 
         self.monster_ai.update(dt)
 
@@ -521,17 +569,44 @@ class Monster(Entity):
         if len(self.helpers) != 0:
             for h in self.helpers:
                 h.update(dt)
-        else:
-            self.helpers_active = False
+        elif self.helpers_active:
+            self.set_helpers_active(False)
 
-    def render(self, surf: pygame.Surface) -> None:
+    def set_helpers_active(self, active: bool) -> None:
+        """
+        Raise or drop the helper shield.
+
+        While the helpers are up only they can be hit, so they take the
+        monster's place in the collision layers.
+
+        :param active: whether the helpers are up.
+        :returns: None
+        """
+        self.helpers_active = active
+        collision = self.game.collision
+
+        for h in self.helpers:
+            h.active = active
+            if active:
+                collision.register(h, h.rect)
+                self.game.pattern_scheduler.wake(h)
+            else:
+                collision.unregister(h)
+
+        if active:
+            collision.unregister(self)
+        elif not self.is_dead:
+            collision.register(self, self.rect)
+
+    def render(self, surf: pygame.Surface, alpha: float = 1.0) -> None:
         """
         Draws the monster.
 
         :param surf: The surface to draw the player onto.
+        :param alpha: how far between the last two steps to draw, 0 to 1.
         :returns: None
         """
-        super().render(surf)
+        super().render(surf, alpha)
 
         if self.is_dead:
             return
@@ -646,6 +721,10 @@ class Lifebar:
         self.color = (68, 195, 68)  # green
         self.bg_color = (211, 211, 211)  # gray
 
+        # Reused every frame, moved and resized in update
+        self.bg_rect = pygame.Rect(0, 0, 0, 4)
+        self.hp_rect = pygame.Rect(0, 0, 0, 4)
+
     def update(self) -> None:
         """
         Update hit bar visual representation in accordance to
@@ -665,6 +744,12 @@ class Lifebar:
         self.hp = self.owner.hp
         self.max_hp = self.owner.max_hp
 
+        width = self.entity.rect.width
+        self.bg_rect.topleft = (x, y)
+        self.bg_rect.width = width
+        self.hp_rect.topleft = (x, y)
+        self.hp_rect.width = int(width * self.hp / self.max_hp)
+
     def render(self, surf: pygame.Surface) -> None:
         """
         Draw hit bar object.
@@ -672,18 +757,11 @@ class Lifebar:
         :param surf: pygame.Surface
         :returns: None
         """
-        width = self.entity.rect.width
-        ratio = self.hp / self.max_hp
-        current_width = width * ratio
-        height = 4
-
         # Visual hit bar background
-        bg_rect = pygame.Rect(self.life_pos.x, self.life_pos.y, width, height)
-        pygame.draw.rect(surf, self.bg_color, bg_rect)
+        pygame.draw.rect(surf, self.bg_color, self.bg_rect)
 
         # Main visual hit bar
-        hp_rect = pygame.Rect(self.life_pos.x, self.life_pos.y, current_width, height)
-        pygame.draw.rect(surf, self.color, hp_rect)
+        pygame.draw.rect(surf, self.color, self.hp_rect)
 
 
 
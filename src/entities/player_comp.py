@@ -40,14 +40,18 @@ class PlayerLifebar:
         self.total_health = []
         self.add_health_bars()
 
+        # Screen area the hit bar covers, for the HUD
+        self.area = self.total_health[0].unionall(self.total_health)
+
     def add_health_bars(self) -> None:
         """
-        Rectangle objects that represent individual hit points.
+        Rectangle objects that represent individual hit points,
+        placed in a row once.
 
         :returns: None
         """
-        for _ in range(self.hp):
-            rect = pygame.Rect(0, 0, *self.size)
+        for i in range(self.hp):
+            rect = pygame.Rect(10 + i * 12, 10, *self.size)
             self.total_health.append(rect)
 
     def take_damage(self) -> None:
@@ -85,19 +89,8 @@ class PlayerLifebar:
         if self.is_dead:
             return
 
-        # Hit bar placement
-        for i in range(self.hp):
-            if i == 0:
-                self.total_health[i].topleft = (10, 10)
-            else:
-                self.total_health[i].topleft = (
-                    self.total_health[i - 1].x + 12,
-                    self.total_health[i - 1].y,
-                )
-
         for rect in self.total_health:
             pygame.draw.rect(surf, self.color, rect, 0)
-        pass
 
 
 class PlayerMovement:
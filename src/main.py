@@ -1,6 +1,9 @@
+import argparse
+import os
 import pygame
 import sys
 import random
+import time
 
 # world comp 
 from components.world import * 
@@ -8,6 +11,7 @@ from components.world import *
 #configurations 
 from config.boss_config import *
 from config.level_config import * 
+from config.bullet_config import *
 
 # visual 
 from components.visual import * 
@@ -17,6 +21,14 @@ from entities.player_comp import *
 from entities.entity import *
 from entities.enemy_comp import * 
 from components.bullet import *
+from components.bullet_field import *
+from components.collision import *
+from components.pool import *
+from components.pattern import *
+from components.script import *
+from components.hud import *
+from components.present import *
+from components.sprites import *
 from  components.level_eng import * 
 
 
@@ -31,17 +43,53 @@ class Game:
     * bullet pooling
     * event handling 
     """
-    def __init__(self):
+    def __init__(
+        self,
+        timestep: float = 1 / 60,
+        max_substeps: int = 5,
+        fps_cap: int = 60,
+        vsync: bool = False,
+        headless: bool = False,
+        events=None,
+        scale_mode: str = NEAREST,
+    ):
         """
         Initializes Pygame, creates display surfaces and pool bullets 
         and populate entites.
+
+        :param timestep: length of one simulation step, in seconds.
+        :param max_substeps: most simulation steps run per frame.
+        :param fps_cap: most frames drawn per second, 0 for uncapped.
+        :param vsync: wait for the display's refresh before presenting.
+        :param headless: run on SDL's dummy driver without opening a window
+            or rendering, one step per loop as fast as the CPU allows.
+        :param events: called once per loop for the input events, e.g. a
+            ``ScriptedInput``. Defaults to ``pygame.event.get``.
+        :param scale_mode: how the frame is upscaled, one of ``SCALE_MODES``.
         """
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+
         pygame.init()
-        self.screen = pygame.display.set_mode((600, 600))
+        if vsync and not headless:
+            self.screen = pygame.display.set_mode((600, 600), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((600, 600))
         self.display = pygame.Surface((300, 300))
+        self.presenter = Presenter(self.screen, self.display, scale_mode)
+        self.sprites = SpriteCache()  # entity sprites by (size, color)
         self.clock = pygame.time.Clock()
         self.running = True
         self.screenshake = 0
+        self.events = events or pygame.event.get
+        self.steps = 0
+
+        # Fixed-step loop
+        self.timestep = timestep
+        self.max_substeps = max_substeps
+        self.fps_cap = fps_cap
+        self.accumulator = 0.0
 
         #Scroll system & Level
         self.explosions = []
@@ -55,18 +103,27 @@ class Game:
         self.game_state = True
 
         # Entity Tracking 
-        self.bullets = []  # Active player bullets
         self.entities = []  # Collidable participants 
+        self.pattern_scheduler = PatternScheduler(self)  # wakes patterns when due
+
+        # Collision layers and the (attacker, target) dispatch table
+        self.collision = CollisionWorld()
+        self.collision.on(ENEMY_BULLET, PLAYER, self._hit_player)
+        self.collision.on(PLAYER_BULLET, ENEMY, self._hit_enemy)
+        self.collision.on(PLAYER_BULLET, HELPER, self._hit_helper)
+        self.bounds_kind = self.collision.on(PLAYER_BULLET, BOUNDS, self._spend)
+
+        # Player bullet and spark pools
+        self.sparks = ObjectPool(lambda: Spark((0, 0), 0.0, 0.0, (255, 255, 255)), 256)
+        self.player_bullets = ObjectPool(lambda: BulletAK(self), 32)
+        self.bullets = self.player_bullets.live  # Active player bullets
 
         # Bullet Pooling
-        # pre-allocate 1000 bullets 
-        self.monster_bullets = pygame.sprite.Group() 
-        for _ in range(300):
-            self.monster_bullets.add(Bullet(self, design=PurpleBullet()))
-        for _ in range(300):
-            self.monster_bullets.add(Bullet(self, design=YellowBullet()))
-        for _ in range(300):
-            self.monster_bullets.add(Bullet(self, design=BlueBullet()))
+        # pre-allocate one sub-pool per design into a structure-of-arrays field
+        designs = (PurpleBullet(), YellowBullet(), BlueBullet())
+        self.monster_bullets = BulletField(
+            self, [SubPool(d, **BULLET_POOLS[d.id]) for d in designs]
+        )
 
         # Object initialization
         # self.platform = Platform()
@@ -84,6 +141,17 @@ class Game:
         
         self.entities.extend([self.player]) # self.enemy
 
+        # HUD, drawn over the world and redrawn only on change
+        self.text_cache = TextCache()
+        self.hud = Hud(self.display.get_size())
+        hit_bar = self.player.life_stats
+        self.hud.add(Widget(hit_bar.area, lambda: hit_bar.hp, hit_bar.render))
+        # Debug scroll distance
+        self.hud.add(Label(
+            (210, 290), lambda: int(self.scroll.distance), "scroll distance: {}",
+            self.text_cache, background=(0, 0, 0), glyphs=True,
+        ))
+
     def collisionSystem(self) -> None:
         """
         process all object interactions for the current frame. 
@@ -95,69 +163,84 @@ class Game:
         * player bullet vs Monster and Helpers collision.
 
         ..note::
-            This method also removes bullets from the active list and marks them for reuse.
+            Detection only records ``(attacker, target, kind, position)``
+            events; ``resolve()`` then hands each kind to its handler.
+            The handlers remove bullets from the active list and mark them for reuse.
         """
         screen_rect = self.screen.get_rect()
+        collision = self.collision
+        events = collision.events
         if self.collision_on:
+            collision.prune()
             
             # monster bullet vs player collision.
-            for b in (b for b in self.monster_bullets if b.active):
-                if b.rect.colliderect(self.player.collision_rect):
-                    self.player.life_stats.take_damage()
-                    #self.player.spawn_blood()
-                    self.player.collision()
-                    b.active = False
-                    continue
-
+            # only bullets in the grid cells around the target are tested
+            field = self.monster_bullets
+            for hitboxes, kind in collision.targets(field.layer, field.mask):
+                for target, rect in hitboxes:
+                    hits = field.hits(rect, field.near(rect))
+                    if hits.size:
+                        events.extend(hits.tolist(), target, kind, *field.positions(hits))
+
+            live = []
             for b in self.bullets:
                 if not b.active:
                     continue
                 
                 # Check screen boundaries
                 if not screen_rect.colliderect(b.rect):
-                    b.active = False
-                    b.collided()
+                    events.push(b, None, self.bounds_kind, b.pos.x, b.pos.y)
                     continue
 
-                for e in self.entities:
-                    if e.is_dead:
-                        continue
-
-                    hit = False
+                live.append(b)
 
-                    # Check Boss Helpers
-                    if hasattr(e, "helpers_active") and e.helpers_active:
-                        for help in e.helpers.copy():
-                            if b.rect.colliderect(help.rect):
-                                self.screenshake = max(10, self.screenshake)
-                                help.life_stats.take_damage(b.damage)
-                                hit = True
-                                break
-
-                        if hit:
-                            b.active = False
-                            b.collided()
+            # player bullet vs Monster and Helpers collision.
+            # only pairs whose x intervals overlap reach ``clipline``
+            if live:
+                pairs = collision.sweep(live, PLAYER_BULLET, live[0].mask)
+                for b, candidates in pairs.values():
+                    for _, _, target, rect, kind in candidates:
+                        if b.check_collision(rect):
+                            events.push(b, target, kind, b.pos.x, b.pos.y)
                             break #stop checking other enemies 
 
-                    
-                    if e.name == "grunt" and b.check_collision(e):
-                        self.screenshake = max(10, self.screenshake)
-                        e.life_stats.take_damage(b.damage)
-                        e.flash_state = True
-                        hit = True
-                       
-                    # Damge the boss only if helpers are down
-                    elif e.name == "boss" and not e.helpers_active and b.check_collision(e):
-                            self.screenshake = max(10, self.screenshake)
-                            e.life_stats.take_damage(b.damage)
-                            e.flash_state = True
-                            hit = True
-
-                    if hit:
-                        b.active = False
-                        b.collided()
-                        break
-                    
+        collision.resolve()
+
+    # Collision handlers, see ``__init__`` for the dispatch table.
+    # Each gets every hit of its kind this frame at once.
+    def _hit_player(self, slots: list, players: list, positions) -> None:
+        for player in players:
+            player.life_stats.take_damage()
+            #player.spawn_blood()
+            player.collision()
+        self.monster_bullets.release(slots)
+
+    def _hit_enemy(self, bullets: list, enemies: list, positions) -> None:
+        self.screenshake = max(10, self.screenshake)
+        for b, enemy in zip(bullets, enemies):
+            enemy.life_stats.take_damage(b.damage)
+            enemy.flash_state = True
+        self._spend(bullets)
+
+    def _hit_helper(self, bullets: list, helpers: list, positions) -> None:
+        self.screenshake = max(10, self.screenshake)
+        for b, helper in zip(bullets, helpers):
+            helper.life_stats.take_damage(b.damage)
+        self._spend(bullets)
+
+    def _spend(self, bullets: list, targets: list | None = None, positions=None) -> None:
+        for b in bullets:
+            b.active = False
+            b.collided()
+
+    @property
+    def frame_allocations(self) -> int:
+        """
+        Objects the player bullet and spark pools had to create this frame.
+
+        :returns: int
+        """
+        return self.player_bullets.frame_allocations + self.sparks.frame_allocations
 
     def game_over(self) -> None:
         """
@@ -168,6 +251,74 @@ class Game:
         # TODO
         pass 
 
+    def update(self, dt: float) -> None:
+        """
+        Advance the simulation one fixed step.
+
+        :param dt: the fixed step, in seconds.
+        :returns: None
+        """
+        self.player_bullets.sweep(lambda b: b.finished)
+        self.entities = [e for e in self.entities if not (e.is_dead and e.exploded)]
+        self.explosions = [exp for exp in self.explosions if not exp.finished]
+
+        # where entities were, for render interpolation
+        for e in self.entities:
+            e.prev_pos.update(e.pos)
+
+        # Delay screenshake over time
+        self.screenshake = max(0, self.screenshake - 1)
+        
+        self.scroll.update(dt)
+        self.game_level.update()
+
+        for e in self.entities:
+            e.update(dt)
+
+        self.pattern_scheduler.update(dt)
+
+        for exp in self.explosions:
+            exp.update(dt)
+
+        # self.transition_sys.update(dt) # TODO Enemy uses transition
+
+        for b in self.bullets:
+            b.update()
+
+        self.monster_bullets.update(dt)
+
+        self.collisionSystem() 
+        self.steps += 1
+
+    def render(self, alpha: float) -> None:
+        """
+        Draw the world and present it.
+
+        :param alpha: how far between the last two steps to draw, 0 to 1.
+        :returns: None
+        """
+        self.display.fill((18, 18, 28))
+
+        for e in self.entities:  
+            e.render(self.display, alpha)
+
+        for exp in self.explosions:
+            exp.render(self.display)
+
+        self.monster_bullets.render(self.display, alpha)
+
+        for b in self.bullets:
+            b.render(self.display, alpha)
+
+        self.hud.update()
+        self.hud.render(self.display)
+
+        screenshake_offset = (
+            SHAKE_RANDOM.random() * self.screenshake - self.screenshake / 2,
+            SHAKE_RANDOM.random() * self.screenshake - self.screenshake / 2,
+        )
+        self.presenter.present(self.display, screenshake_offset)
+
     def run(self) -> None:
         """
         The main game loop.
@@ -175,33 +326,37 @@ class Game:
         Handles
         """""""
         * input logic 
-        * update logic
-        * rending
+        * fixed-step update logic
+        * rending, interpolated between steps
         * screenshake
-        
-        :param self: Description
+
+        ..note::
+            The simulation always advances in steps of ``timestep``, however
+            long a frame takes. A frame runs at most ``max_substeps`` steps;
+            time beyond that is dropped so a slow frame can't snowball.
+
+            Headless games skip the clock and rendering and run exactly one
+            step per loop. A ``QUIT`` event stops the loop instead of exiting.
         """
         while self.running:
-            self.display.fill((18, 18, 28))
-            dt = self.clock.tick(60) / 1000.0
-
-            # UPDATE OBJECTS 
-            #----------------
-            self.active_mons_bullet =  [b for b in self.monster_bullets if b.active]
-            self.bullets = [b for b in self.bullets if b.active or b.bullet_effect or b.collision_effect]
-            self.entities = [e for e in self.entities if not (e.is_dead and e.exploded)]
-            self.explosions = [exp for exp in self.explosions if not exp.finished]
-            #-----------------
-
-            # Delay screenshake over time
-            self.screenshake = max(0, self.screenshake - 1)
-            
-            self.scroll.update(dt)
-            self.game_level.update()
+            if self.headless:
+                frame_time = self.timestep
+            else:
+                # the loop's only clock tick, ``fps_cap`` 0 runs uncapped
+                frame_time = self.clock.tick(self.fps_cap) / 1000.0
+            self.accumulator = min(
+                self.accumulator + frame_time, self.timestep * self.max_substeps
+            )
+
+            self.sparks.begin_frame()
+            self.player_bullets.begin_frame()
 
             # Event handling 
-            for event in pygame.event.get():
+            for event in self.events():
                 if event.type == pygame.QUIT:
+                    if self.headless:
+                        self.running = False
+                        break
                     pygame.quit()
                     sys.exit()
 
@@ -211,53 +366,46 @@ class Game:
 
                 self.player.movement.handle_input(event)
 
-            for e in self.entities:
-                e.update(dt)
-
-            for exp in self.explosions:
-                exp.update(dt)
-
-            # self.transition_sys.update(dt) # TODO Enemy uses transition
-
-            for b in self.bullets:
-                b.update()
-
-            for b in self.active_mons_bullet:
-                b.update(dt) #dt
-
-            self.collisionSystem() 
+            if not self.running:
+                break
 
-            # RENDERING 
-            for e in self.entities:  
-                e.render(self.display)
+            while self.accumulator >= self.timestep:
+                self.update(self.timestep)
+                self.accumulator -= self.timestep
 
-            for exp in self.explosions:
-                exp.render(self.display)
-
-            for b in self.active_mons_bullet:
-                b.render(self.display) #dt
-
-            for b in self.bullets:
-                b.render(self.display)
-
-            # Debug scroll distance
-            font = pygame.font.SysFont(None, 12)
-            text = font.render(
-                f"scroll distance: {int(self.scroll.distance)}", False, (200, 200, 200), (0,0,0)
-            )
-            self.display.blit(text, (210, 290))
-
-            screenshake_offset = (
-                random.random() * self.screenshake - self.screenshake / 2,
-                random.random() * self.screenshake - self.screenshake / 2,
-            )
-            self.screen.blit(
-                pygame.transform.scale(self.display, self.screen.get_size()),
-                screenshake_offset,
-            )
-            pygame.display.update()
-            self.clock.tick(60)
+            if not self.headless:
+                self.render(self.accumulator / self.timestep)
 
 # Initiate Game 
 if __name__ == "__main__":
-    Game().run()
+    parser = argparse.ArgumentParser(description="YOU vs RED")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window or rendering")
+    parser.add_argument("--script", help="scripted input file, see ScriptedInput.load")
+    parser.add_argument("--steps", type=int, default=None,
+                        help="steps to run before quitting (headless defaults to 3600)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--scale", choices=SCALE_MODES, default=NEAREST,
+                        help="how the frame is upscaled to the window")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    events = None
+    if args.headless or args.script:
+        steps = args.steps
+        if steps is None and args.headless:
+            steps = 3600
+        if args.script:
+            events = ScriptedInput.load(args.script, steps)
+        else:
+            events = ScriptedInput(steps=steps)
+
+    game = Game(headless=args.headless, events=events, scale_mode=args.scale)
+    start = time.perf_counter()
+    game.run()
+
+    if args.headless:
+        elapsed = time.perf_counter() - start
+        print(f"{game.steps} steps in {elapsed:.2f}s ({game.steps / elapsed:.0f} steps/s)")
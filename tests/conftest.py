@@ -0,0 +1,49 @@
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+import pygame
+import pytest
+
+from components.bullet import BlueBullet, PurpleBullet, YellowBullet
+from components.bullet_field import BulletField, SubPool
+from config.bullet_config import BULLET_POOLS
+
+
+@pytest.fixture
+def owner():
+    """
+    The parts of ``Game`` a ``BulletField`` reads: the play area and the player.
+    """
+    pygame.init()
+    return SimpleNamespace(
+        display=pygame.Surface((300, 300)),
+        player=SimpleNamespace(pos=pygame.Vector2(150, 225)),
+    )
+
+
+@pytest.fixture
+def field(owner):
+    designs = (PurpleBullet(), YellowBullet(), BlueBullet())
+    return BulletField(owner, [SubPool(d, **BULLET_POOLS[d.id]) for d in designs])
+
+
+@pytest.fixture
+def game():
+    """
+    A headless ``Game``, ``run()`` it with a ``ScriptedInput`` as ``game.events``.
+    """
+    import main
+
+    # the level's spawn events are module state, marked as they trigger
+    for event in main.EVENTS:
+        event.triggered = False
+
+    random_state = main.random.getstate()
+    main.random.seed(1)
+    yield main.Game(headless=True)
+    main.random.setstate(random_state)
@@ -0,0 +1,162 @@
+import warnings
+
+import numpy as np
+import pygame
+
+from components.bullet_field import NEVER
+
+
+def test_bullet_that_never_leaves_stays_live(field):
+    field.advance(10)
+    bullet = field.acquire(1, "yellow")[0]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        bullet.activate((150, 150), 0.0, 0, 0)
+
+    assert field.expire[bullet.index] == NEVER
+    field.advance(100)
+    assert field.active[bullet.index]
+
+
+def test_exit_ticks_mix_finite_and_never(field):
+    slots = np.array([b.index for b in field.acquire(2, "yellow")])
+    field.activate(slots[0], (150, 150), 0.0, 0, 0)
+    field.activate(slots[1], (150, 150), 0.0, 10, 0)
+
+    assert field.expire[slots[0]] == NEVER
+    assert field.tick < field.expire[slots[1]] < field.tick + 30
+
+
+def fire_random(field, rng, n=300):
+    """
+    Fire ``n`` bullets of random designs along random rays, some curving.
+    """
+    for design in ("purple", "yellow", "blue"):
+        for bullet in field.acquire(n // 3, design):
+            bullet.activate(
+                (rng.uniform(0, 300), rng.uniform(0, 300)),
+                rng.uniform(-np.pi, np.pi),
+                rng.uniform(0, 6),
+                rng.uniform(0, 20),
+                accel=rng.choice([0.0, rng.uniform(-0.1, 0.1)]),
+                ang_vel=rng.choice([0.0, 0.0, rng.uniform(-0.05, 0.05)]),
+            )
+
+
+def random_rect(rng):
+    return pygame.Rect(
+        rng.integers(-20, 300), rng.integers(-20, 300),
+        rng.integers(1, 30), rng.integers(1, 30),
+    )
+
+
+def test_hits_match_colliderect(field):
+    rng = np.random.default_rng(11)
+    fire_random(field, rng)
+
+    for _ in range(40):
+        field.advance(int(rng.integers(1, 4)))
+        live = field.live()
+        for _ in range(10):
+            rect = random_rect(rng)
+            expected = {int(i) for i in live if field.rect(i).colliderect(rect)}
+
+            assert set(field.hits(rect, shapes=False, swept=False).tolist()) == expected
+            # the shape tests only ever narrow the bounding rects down
+            assert set(field.hits(rect, swept=False).tolist()) <= expected
+            # and the broadphase only ever widens them
+            assert expected <= set(field.near(rect).tolist())
+
+
+def crossed(field, index, rect, samples=100):
+    """
+    Whether the sprite of ``index`` overlapped ``rect`` somewhere on its way
+    from the previous tick, checked at ``samples`` points along the step.
+    """
+    x, y = field.positions(np.array([index]), field.tick - 1)
+    before = field.rect(index).copy()
+    before.center = (float(x[0]), float(y[0]))
+    after = field.rect(index)
+
+    for t in np.linspace(0, 1, samples + 1)[1:-1]:
+        left = before.left + t * (after.left - before.left)
+        top = before.top + t * (after.top - before.top)
+        if (left < rect.right and left + after.width > rect.left
+                and top < rect.bottom and top + after.height > rect.top):
+            return True
+    return False
+
+
+def test_slow_bullets_hit_where_they_are_or_crossed(field):
+    # a hit needs the sprite on the 2x4 hitbox now or on the way here
+    rng = np.random.default_rng(12)
+    for design in ("purple", "yellow", "blue"):
+        for bullet in field.acquire(100, design):
+            bullet.activate(
+                (rng.uniform(100, 200), rng.uniform(100, 200)),
+                rng.uniform(-np.pi, np.pi), rng.uniform(0.5, 1.5), 0,
+            )
+
+    for _ in range(60):
+        field.advance(1)
+        for _ in range(10):
+            rect = pygame.Rect(rng.integers(100, 200), rng.integers(100, 200), 2, 4)
+            touching = {int(i) for i in field.live() if field.rect(i).colliderect(rect)}
+            hits = set(field.hits(rect).tolist())
+            assert set(field.hits(rect, swept=False).tolist()) <= touching
+            assert all(crossed(field, i, rect) for i in hits - touching)
+
+
+def test_fast_bullets_do_not_tunnel(field):
+    hitbox = pygame.Rect(0, 0, 3, 3)
+    hitbox.center = (150, 150)
+    down, across = field.acquire(1, "yellow")[0], field.acquire(1, "purple")[0]
+    down.activate((150, 20), np.pi / 2, 40, 0)
+    across.activate((20, 150), 0.0, 37, 0)
+    # clips the corner of a 2x4 hitbox between two ticks, never on one
+    corner = pygame.Rect(50, 250, 2, 4)
+    diagonal = field.acquire(1, "yellow")[0]
+    diagonal.activate((40, 230), np.pi / 4, np.sqrt(200), 0)
+
+    hit, clipped = set(), 0
+    for _ in range(8):
+        field.advance(1)
+        assert not set(field.hits(hitbox, swept=False).tolist())
+        assert diagonal.index not in field.hits(corner, swept=False)
+        hit |= set(field.hits(hitbox).tolist())
+        clipped += diagonal.index in field.hits(corner)
+    assert hit == {down.index, across.index}
+    assert clipped == 1
+
+
+def test_round_bullet_corner_miss_stays_a_miss(field):
+    # only the transparent corner of the 12x12 sprite overlaps the hitbox
+    hitbox = pygame.Rect(150, 150, 2, 4)
+    slow = field.acquire(1, "purple")[0]
+    slow.activate((144, 145), 0.0, 1, 0)
+    field.advance(1)
+    assert field.rect(slow.index).colliderect(hitbox)
+    assert slow.index not in field.hits(hitbox)
+
+
+def test_fast_round_bullet_passing_a_corner_misses(field):
+    # steps 20 px diagonally past the hitbox's corner, at best 7 px from it
+    hitbox = pygame.Rect(150, 150, 2, 4)
+    fast = field.acquire(1, "purple")[0]
+    fast.activate((145, 145), -np.pi / 4, 20, -20)
+
+    for _ in range(3):
+        field.advance(1)
+        assert fast.index not in field.hits(hitbox)
+
+
+def test_untyped_requests_keep_to_the_default_design(field):
+    designs = set()
+    for _ in range(40):
+        designs |= {b.id for b in field.acquire(12)}
+
+    # 480 bullets: past purple's 300, so it grew rather than borrowing
+    assert designs == {"purple"}
+    assert len(field.pool_by_id["purple"].slots) > 300
+    assert field.pool_by_id["yellow"].in_use == field.pool_by_id["blue"].in_use == 0
@@ -0,0 +1,61 @@
+import random
+from types import SimpleNamespace
+
+import pygame
+
+from components.bullet import BulletAK
+from components.collision import ENEMY, HELPER, PLAYER_BULLET, CollisionWorld
+
+
+def random_target(rng, layer):
+    rect = pygame.Rect(rng.randint(-20, 300), rng.randint(-20, 300), rng.randint(1, 40), rng.randint(1, 40))
+    return SimpleNamespace(layer=layer, is_dead=False), rect
+
+
+def move_bullet(rng, bullet):
+    bullet.prev_pos.update(rng.uniform(-20, 320), rng.uniform(-20, 320))
+    bullet.pos.update(bullet.prev_pos + pygame.Vector2(rng.uniform(-40, 40), rng.uniform(-40, 40)))
+    bullet.rect.center = bullet.pos
+
+
+def test_sweep_candidates_cover_every_clipline_hit():
+    rng = random.Random(3)
+    world = CollisionWorld()
+    for layer in (ENEMY, HELPER):
+        world.on(PLAYER_BULLET, layer, lambda *hits: None)
+
+    bullets = [BulletAK(None) for _ in range(60)]
+    for bullet in bullets:
+        bullet.active = True
+    targets = [random_target(rng, rng.choice((ENEMY, HELPER))) for _ in range(20)]
+    for owner, rect in targets:
+        world.register(owner, rect)
+
+    seen = 0
+    for _ in range(50):
+        # entries come and go between frames and the rest move
+        for owner, rect in rng.sample(targets, min(4, len(targets))):
+            world.unregister(owner)
+            targets.remove((owner, rect))
+        for _ in range(rng.randint(0, 6)):
+            owner, rect = random_target(rng, rng.choice((ENEMY, HELPER)))
+            world.register(owner, rect)
+            targets.append((owner, rect))
+        for _, rect in targets:
+            rect.move_ip(rng.randint(-15, 15), rng.randint(-15, 15))
+        for bullet in bullets:
+            move_bullet(rng, bullet)
+        flying = rng.sample(bullets, rng.randint(0, len(bullets)))
+
+        pairs = world.sweep(flying, PLAYER_BULLET, flying[0].mask if flying else ENEMY | HELPER)
+        for bullet in flying:
+            hit = {id(owner) for owner, rect in targets if bullet.check_collision(rect)}
+            _, candidates = pairs.get(id(bullet), (bullet, []))
+            assert hit <= {id(target) for _, _, target, _, _ in candidates}
+            seen += len(hit)
+
+        # nothing that sat this frame out is paired
+        gone = {id(b) for b in bullets} - {id(b) for b in flying}
+        assert not gone & set(pairs)
+
+    assert seen
@@ -0,0 +1,109 @@
+import pygame
+
+from components.script import ScriptedInput
+
+
+def test_homing_after_the_player_moved(game):
+    game.events = ScriptedInput([(0, pygame.KEYDOWN, pygame.K_LEFT)], steps=10)
+    game.run()
+    start = pygame.Vector2(game.player.pos)
+    assert start != (150, 225)
+
+    bullet = game.monster_bullets.acquire(1, "yellow")[0]
+    bullet.activate((150, 50), 0.0, 1.5, 0, homing=0.05)
+    for _ in range(60):
+        game.monster_bullets.update(game.timestep)
+
+    # turned from heading right towards the player, below and to the left
+    assert game.monster_bullets.heading[bullet.index] > 0.5
+
+
+def test_no_held_patterns_cycle_through_the_heap(game):
+    game.player.life_stats.take_damage = lambda *args: None
+    game.events = ScriptedInput(steps=3000)
+    game.run()
+
+    assert not [pattern for *_, pattern in game.pattern_scheduler.heap if pattern.held]
+
+
+def play(game, steps):
+    """
+    Run ``game`` on a fixed script: fire often, weave left and right.
+    """
+    script = [(step, pygame.KEYDOWN, pygame.K_SPACE) for step in range(0, steps, 5)]
+    for step in range(0, steps, 120):
+        script += [(step, pygame.KEYDOWN, pygame.K_LEFT), (step + 60, pygame.KEYUP, pygame.K_LEFT)]
+        script += [(step + 60, pygame.KEYDOWN, pygame.K_RIGHT), (step + 119, pygame.KEYUP, pygame.K_RIGHT)]
+    game.player.life_stats.take_damage = lambda *args: None
+    game.events = ScriptedInput(script, steps)
+    try:
+        game.run()
+    except SystemExit:
+        pass
+
+    field = game.monster_bullets
+    live = field.live()
+    return (
+        game.steps,
+        tuple(game.player.pos),
+        [(e.name, tuple(e.pos), e.life_stats.hp) for e in game.entities[1:]],
+        live.tolist(),
+        [list(v) for v in field.positions(live)],
+        [tuple(spark.pos) for spark in game.sparks.live],
+        [[tuple(p.pos) for p in explosion.particles] for explosion in game.explosions],
+    )
+
+
+def test_headless_and_windowed_runs_agree(game):
+    import main
+
+    class FrameClock:
+        # one step per frame
+        def tick(self, fps=0):
+            return 16
+
+    game.timestep = 0.016
+    headless = play(game, 2400)
+
+    for event in main.EVENTS:
+        event.triggered = False
+    main.random.seed(1)
+    windowed = main.Game(timestep=0.016)
+    windowed.clock = FrameClock()
+    assert play(windowed, 2400) == headless
+
+
+def test_transition_clears_bullets_in_update_only(game):
+    from entities.enemy_comp import MonstersGun
+
+    gun = MonstersGun()
+    gun.owner = game.player  # anything with a ``game``
+    bullet = game.monster_bullets.acquire(1, "yellow")[0]
+    bullet.activate((150, 150), 0.0, 0, 0)
+    game.transition_sys.active = True
+
+    gun.render(game.display)
+    assert bullet.active
+    gun.update()
+    assert not bullet.active
+
+
+def test_rapid_fire_allocates_nothing_after_warm_up(game):
+    counts = []
+    step = game.update
+
+    def update(dt):
+        step(dt)
+        counts.append(game.frame_allocations)
+
+    game.update = update
+    game.player.life_stats.take_damage = lambda *args: None
+    game.events = ScriptedInput(
+        [(n, pygame.KEYDOWN, pygame.K_SPACE) for n in range(0, 3000, 2)], 3000
+    )
+    game.run()
+
+    # the pools grow to the peak of live bullets and sparks, then stop
+    assert len(counts) == 3000
+    assert sum(counts[1200:]) == 0
+    assert game.player_bullets.allocations + game.sparks.allocations == sum(counts)
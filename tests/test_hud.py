@@ -0,0 +1,38 @@
+import pygame
+
+from components.hud import Hud, Label, TextCache
+
+
+class CountingFont:
+    """
+    Wraps a font and counts its renders.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.renders = 0
+
+    def render(self, *args):
+        self.renders += 1
+        return self.font.render(*args)
+
+
+def test_changing_label_stops_rendering_after_warm_up():
+    pygame.font.init()
+    cache = TextCache(capacity=8)
+    font = cache.fonts[(None, 12)] = CountingFont(cache.font(12))
+    counter = [0]
+    hud = Hud((300, 300))
+    label = hud.add(Label((10, 10), lambda: counter[0], "distance: {}", cache, glyphs=True))
+
+    for counter[0] in range(10):
+        hud.update()
+    warm = font.renders
+
+    for counter[0] in range(10, 2000, 7):
+        hud.update()
+    assert font.renders == warm
+    assert not cache.texts
+    assert len(cache.glyphs) == len(set("distance: 0123456789"))
+    glyphs = [cache.glyphs[(c, 12, label.color, None, None)] for c in f"distance: {label.shown}"]
+    assert label.rect.width == sum(glyph.get_width() for glyph in glyphs)
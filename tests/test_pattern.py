@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from components.pattern import PatternEngine, PatternProgram, PatternScheduler
+
+
+class Shooter:
+    def __init__(self, game):
+        self.game = game
+        self.is_dead = False
+        self.ready = False
+
+    def can_fire(self):
+        return self.ready
+
+
+def make_shooter():
+    game = SimpleNamespace(transition_sys=SimpleNamespace(active=False))
+    game.pattern_scheduler = PatternScheduler(game)
+    owner = Shooter(game)
+
+    fired = []
+    program = PatternProgram("test", lambda engine, _pattern: fired.append(engine), {}, 0.5, None)
+    engine = PatternEngine()
+    engine.add_program(program)
+    engine.owner = owner
+    return game.pattern_scheduler, owner, fired
+
+
+def test_held_patterns_leave_the_heap():
+    scheduler, owner, fired = make_shooter()
+    for _ in range(600):
+        scheduler.update(1 / 60)
+
+    assert len(scheduler) == 0
+    assert len(scheduler.parked[owner]) == 1
+    assert not fired
+
+
+def test_wake_fires_a_full_interval_later():
+    scheduler, owner, fired = make_shooter()
+    scheduler.update(1 / 60)
+
+    owner.ready = True
+    scheduler.wake(owner)
+    assert owner not in scheduler.parked
+
+    for _ in range(29):
+        scheduler.update(1 / 60)
+    assert not fired
+    scheduler.update(1 / 60)
+    scheduler.update(1 / 60)
+    assert len(fired) == 1
+
+
+def test_boss_phases_are_compiled_on_import():
+    from config.boss_config import BOSS_PHASES
+
+    for phase in BOSS_PHASES.values():
+        assert phase["patterns"]
+        assert all(isinstance(p, PatternProgram) for p in phase["patterns"])
+
+
+def test_phase_machine_compiles_raw_specs():
+    from config.boss_config import BOSS_PHASES, level
+    from entities.enemy_comp import PhaseMachine
+
+    machine = PhaseMachine(level)
+    for key, phase in machine.level.items():
+        compiled = BOSS_PHASES[key]["patterns"]
+        assert [(p.name, p.kwargs) for p in phase["patterns"]] == [(p.name, p.kwargs) for p in compiled]
+    # compiled phases are taken as they are
+    assert PhaseMachine(BOSS_PHASES).level == BOSS_PHASES
+
+    bad = {"phase_1": dict(level["phase_1"], patterns=[("spray", dict(nope=1))])}
+    with pytest.raises(ValueError):
+        PhaseMachine(bad)
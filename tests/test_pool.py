@@ -0,0 +1,45 @@
+import random
+
+from components.pool import ObjectPool
+
+
+class Thing:
+    def reset(self, value):
+        self.value = value
+
+
+def check(pool, expected):
+    assert sorted(t.value for t in pool.live) == sorted(expected)
+    assert all(t.pool_slot == i for i, t in enumerate(pool.live))
+    assert not set(map(id, pool.live)) & set(map(id, pool.free))
+
+
+def test_release_and_sweep_keep_the_live_list_packed():
+    rng = random.Random(5)
+    pool = ObjectPool(Thing, 8)
+    expected = []
+
+    for n in range(2000):
+        roll = rng.random()
+        if roll < 0.5:
+            pool.acquire(n)
+            expected.append(n)
+        elif roll < 0.8 and pool.live:
+            thing = rng.choice(pool.live)
+            pool.release(thing)
+            expected.remove(thing.value)
+        else:
+            mod = rng.randint(2, 5)
+            pool.sweep(lambda t: t.value % mod == 0)
+            expected = [v for v in expected if v % mod]
+        check(pool, expected)
+
+
+def test_sweep_releases_neighbours_swapped_into_place():
+    pool = ObjectPool(Thing, 0)
+    for n in range(10):
+        pool.acquire(n)
+
+    pool.sweep(lambda t: t.value in (0, 8, 9))
+    check(pool, [1, 2, 3, 4, 5, 6, 7])
+    assert pool.allocations == 10
@@ -0,0 +1,58 @@
+import random
+
+from components.timer_wheel import TimerWheel
+
+
+def test_items_come_back_on_their_tick():
+    rng = random.Random(7)
+    # 16 slots a level: level 0 < 16, level 1 < 256, level 2 < 4096, then overflow
+    wheel = TimerWheel(now=37, bits=4, levels=3)
+    expected = {}
+
+    def schedule(item, delay):
+        expire = wheel.now + delay
+        wheel.schedule(item, expire)
+        expected.setdefault(expire, []).append(item)
+
+    item = 0
+    for low, high in ((1, 15), (16, 255), (256, 4095), (4096, 9000)):
+        for _ in range(200):
+            schedule(item, rng.randint(low, high))
+            item += 1
+    # exactly on the level boundaries
+    for delay in (15, 16, 255, 256, 4095, 4096):
+        schedule(item, delay)
+        item += 1
+
+    end = max(expected)
+    while wheel.now < end:
+        # keep scheduling while the wheel turns and cascades
+        if wheel.now % 97 == 0 and wheel.now < 5000:
+            schedule(item, rng.choice([1, 16, 300, 5000]))
+            item += 1
+            end = max(end, max(expected))
+        due = wheel.tick()
+        assert sorted(due) == sorted(expected.pop(wheel.now, []))
+
+    assert not expected
+    assert not wheel.overflow
+    assert not any(slot for level in wheel.wheels for slot in level)
+
+
+def test_default_wheel_boundaries():
+    wheel = TimerWheel(now=5)
+    delays = (1, 63, 64, 4095, 4096, 262143, 262144, 300000)
+    for delay in delays:
+        wheel.schedule(delay, wheel.now + delay)
+
+    back = {}
+    while wheel.now < 5 + max(delays):
+        for item in wheel.tick():
+            back[item] = wheel.now - 5
+    assert back == {delay: delay for delay in delays}
+
+
+def test_past_expiry_comes_back_next_tick():
+    wheel = TimerWheel(now=100)
+    wheel.schedule("late", 50)
+    assert wheel.tick() == ["late"]